@@ -151,7 +151,7 @@ class ChatAgent:
                 passengers_df = data['passengers']
                 records_count = passengers_df.shape[0]
                 if 'Total' in passengers_df.columns:
-                    total_passengers = passengers_df['Total'].sum()
+                    total_passengers = passengers_df['Total'].astype('float64').sum()
                     return f"Tienes {records_count} registros de pasajeros. El total de pasajeros es: {total_passengers:,.0f}."
                 else:
                     return f"Tienes {records_count} registros de pasajeros disponibles."
@@ -217,7 +217,7 @@ class ChatAgent:
             passengers_df = data['passengers']
             context_info.append(f"✈️ Pasajeros: {passengers_df.shape[0]} registros con {passengers_df.shape[1]} columnas")
             if 'Total' in passengers_df.columns:
-                total_passengers = passengers_df['Total'].sum()
+                total_passengers = passengers_df['Total'].astype('float64').sum()
                 context_info.append(f"   - Total de pasajeros: {total_passengers:,.0f}")
             if 'Country' in passengers_df.columns:
                 countries_count = passengers_df['Country'].nunique()
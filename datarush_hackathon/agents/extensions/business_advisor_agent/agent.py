@@ -177,7 +177,7 @@ class BusinessAdvisorAgent:
                 }
             
             # Calculate traffic metrics
-            total_passengers = passengers_df['Total'].sum()
+            total_passengers = passengers_df['Total'].astype('float64').sum()
             avg_monthly = passengers_df.groupby('Month')['Total'].mean().mean()
             
             # Find peak and low months
@@ -250,7 +250,7 @@ class BusinessAdvisorAgent:
             if passengers_df is not None and not passengers_df.empty:
                 for month in range(1, 13):
                     month_holidays = monthly_holidays.get(month, 0)
-                    month_traffic = passengers_df[passengers_df['Month'] == month]['Total'].sum()
+                    month_traffic = passengers_df[passengers_df['Month'] == month]['Total'].astype('float64').sum()
                     holiday_impact[month] = {
                         'holidays': month_holidays,
                         'traffic': month_traffic
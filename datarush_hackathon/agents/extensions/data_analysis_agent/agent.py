@@ -150,7 +150,7 @@ def _create_data_summary(data: Dict[str, Any]) -> str:
         summary.append(f"- Passenger Data: {len(passengers_df)} records")
         summary.append(f"  - Countries: {passengers_df['ISO3'].nunique()}")
         summary.append(f"  - Years: {passengers_df['Year'].min()}-{passengers_df['Year'].max()}")
-        summary.append(f"  - Total Passengers: {passengers_df['Total'].sum():,.0f}")
+        summary.append(f"  - Total Passengers: {passengers_df['Total'].astype('float64').sum():,.0f}")
     
     if data.get('holidays') is not None:
         holidays_df = data['holidays']
@@ -17,13 +17,25 @@
 This module provides a simplified integration that works without external dependencies.
 """
 
+import copy
 import os
+import re
 import sys
-from typing import Dict, Any, Optional, List
-import streamlit as st
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, Tuple
 import pandas as pd
 import numpy as np
 
+try:
+    import streamlit as st
+except ImportError:
+    # Streamlit is only needed for UI feedback; batch callers run without it
+    class _NullStreamlit:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+    st = _NullStreamlit()
+
 # Add the parent directory to the path for importing components
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
@@ -31,6 +43,199 @@ from components.data_loader import DataLoader
 from components.filters import Filters
 from components.visualizations import Visualizations
 
+# Country names/codes (English, Spanish, ISO3, ISO2) mapped to ISO3, matched in order
+_COUNTRY_CODES = {
+    'latvia': 'LVA', 'letonia': 'LVA', 'lva': 'LVA', 'lv': 'LVA',
+    'estonia': 'EST', 'est': 'EST', 'ee': 'EST',
+    'lithuania': 'LTU', 'lituania': 'LTU', 'ltu': 'LTU', 'lt': 'LTU',
+    'spain': 'ESP', 'españa': 'ESP', 'esp': 'ESP', 'es': 'ESP',
+    'france': 'FRA', 'francia': 'FRA', 'fra': 'FRA', 'fr': 'FRA',
+    'germany': 'DEU', 'alemania': 'DEU', 'deu': 'DEU', 'de': 'DEU',
+    'italy': 'ITA', 'italia': 'ITA', 'ita': 'ITA', 'it': 'ITA',
+    'portugal': 'PRT', 'prt': 'PRT', 'pt': 'PRT',
+    'poland': 'POL', 'polonia': 'POL', 'pol': 'POL', 'pl': 'POL',
+    'czech': 'CZE', 'republica checa': 'CZE', 'república checa': 'CZE', 'cze': 'CZE', 'cz': 'CZE',
+    'slovakia': 'SVK', 'eslovaquia': 'SVK', 'svk': 'SVK', 'sk': 'SVK',
+    'hungary': 'HUN', 'hungria': 'HUN', 'hungría': 'HUN', 'hun': 'HUN', 'hu': 'HUN',
+    'romania': 'ROU', 'rumania': 'ROU', 'rou': 'ROU', 'ro': 'ROU',
+    'bulgaria': 'BGR', 'bgr': 'BGR', 'bg': 'BGR',
+    'croatia': 'HRV', 'croacia': 'HRV', 'hrv': 'HRV', 'hr': 'HRV',
+    'slovenia': 'SVN', 'eslovenia': 'SVN', 'svn': 'SVN', 'si': 'SVN',
+    'greece': 'GRC', 'grecia': 'GRC', 'grc': 'GRC', 'gr': 'GRC',
+    'cyprus': 'CYP', 'chipre': 'CYP', 'cyp': 'CYP', 'cy': 'CYP',
+    'malta': 'MLT', 'mlt': 'MLT', 'mt': 'MLT',
+    'luxembourg': 'LUX', 'luxemburgo': 'LUX', 'lux': 'LUX', 'lu': 'LUX',
+    'belgium': 'BEL', 'belgica': 'BEL', 'bélgica': 'BEL', 'bel': 'BEL', 'be': 'BEL',
+    'netherlands': 'NLD', 'holanda': 'NLD', 'nld': 'NLD', 'nl': 'NLD',
+    'austria': 'AUT', 'aut': 'AUT', 'at': 'AUT',
+    'switzerland': 'CHE', 'suiza': 'CHE', 'che': 'CHE', 'ch': 'CHE',
+    'denmark': 'DNK', 'dinamarca': 'DNK', 'dnk': 'DNK', 'dk': 'DNK',
+    'sweden': 'SWE', 'suecia': 'SWE', 'swe': 'SWE', 'se': 'SWE',
+    'finland': 'FIN', 'finlandia': 'FIN', 'fin': 'FIN', 'fi': 'FIN',
+    'norway': 'NOR', 'noruega': 'NOR', 'nor': 'NOR', 'no': 'NOR',
+    'iceland': 'ISL', 'islandia': 'ISL', 'isl': 'ISL', 'is': 'ISL',
+    'ireland': 'IRL', 'irlanda': 'IRL', 'irl': 'IRL', 'ie': 'IRL',
+    'united kingdom': 'GBR', 'reino unido': 'GBR', 'gbr': 'GBR', 'gb': 'GBR',
+    'united states': 'USA', 'estados unidos': 'USA', 'usa': 'USA', 'us': 'USA',
+    'canada': 'CAN', 'canadá': 'CAN', 'can': 'CAN', 'ca': 'CAN',
+    'mexico': 'MEX', 'méxico': 'MEX', 'mex': 'MEX', 'mx': 'MEX'
+}
+
+# One pass over the query for every alias; longer aliases first so 'united states' beats 'us'
+_COUNTRY_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, sorted(_COUNTRY_CODES, key=len, reverse=True))) + r')\b'
+)
+
+
+# Two-letter codes double as Spanish words ('de', 'es', 'se'), so they rank after names and ISO3 codes
+_COUNTRY_PRIORITY = {alias: (len(alias) <= 2, rank) for rank, alias in enumerate(_COUNTRY_CODES)}
+
+
+def _passenger_totals(passengers_df: pd.DataFrame) -> pd.Series:
+    """Passenger Total column widened to float64 for accumulation.
+    
+    Total is stored as float32 to save memory; sums and means are taken in
+    float64 so reported totals don't drift and results stay JSON-friendly.
+    """
+    return passengers_df['Total'].astype('float64')
+
+
+def _find_country(query_lower: str) -> Optional[str]:
+    """Return the ISO3 code of the highest-priority country alias mentioned in the query."""
+    aliases = _COUNTRY_RE.findall(query_lower)
+    if not aliases:
+        return None
+    return _COUNTRY_CODES[min(aliases, key=_COUNTRY_PRIORITY.__getitem__)]
+
+
+# Spanish display names indexed by ISO3 code
+_ISO3_TO_NAME = {
+    'LVA': 'Letonia', 'EST': 'Estonia', 'LTU': 'Lituania',
+    'ESP': 'España', 'FRA': 'Francia', 'DEU': 'Alemania',
+    'ITA': 'Italia', 'PRT': 'Portugal', 'POL': 'Polonia',
+    'CZE': 'República Checa', 'SVK': 'Eslovaquia', 'HUN': 'Hungría',
+    'ROU': 'Rumania', 'BGR': 'Bulgaria', 'HRV': 'Croacia',
+    'SVN': 'Eslovenia', 'GRC': 'Grecia', 'CYP': 'Chipre',
+    'MLT': 'Malta', 'LUX': 'Luxemburgo', 'BEL': 'Bélgica',
+    'NLD': 'Países Bajos', 'AUT': 'Austria', 'CHE': 'Suiza',
+    'DNK': 'Dinamarca', 'SWE': 'Suecia', 'FIN': 'Finlandia',
+    'NOR': 'Noruega', 'ISL': 'Islandia', 'IRL': 'Irlanda',
+    'GBR': 'Reino Unido', 'USA': 'Estados Unidos', 'CAN': 'Canadá',
+    'MEX': 'México'
+}
+
+# Spanish month names indexed by month number
+_MONTH_NAMES = {
+    1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
+    5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
+    9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
+}
+
+# Keywords per analysis type, listed in dispatch priority order
+_ANALYSIS_KEYWORDS = (
+    ('trend', ('tendencia', 'evolución', 'crecimiento', 'decrecimiento', 'cambio')),
+    ('holiday', ('feriado', 'holiday', 'impacto', 'efecto', 'influencia')),
+    ('geographic', ('país', 'países', 'región', 'geográfico', 'ubicación')),
+    ('seasonal', ('estacional', 'temporada', 'mes', 'año', 'período')),
+    ('statistical', ('estadística', 'promedio', 'mediana', 'desviación', 'correlación')),
+    ('comparison', ('comparar', 'comparación', 'vs', 'versus', 'diferencia')),
+)
+
+# Single alternation with one named group per analysis type
+_DISPATCH_RE = re.compile('|'.join(
+    f"(?P<{kind}>{'|'.join(map(re.escape, words))})" for kind, words in _ANALYSIS_KEYWORDS
+))
+_DISPATCH_PRIORITY = tuple(kind for kind, _ in _ANALYSIS_KEYWORDS)
+
+# Maximum number of analysis results kept per agent (oldest entries are evicted first)
+_ANALYSIS_CACHE_SIZE = 128
+
+# Caller context options that change an analysis result besides the data and
+# filters (already in the data fingerprint); part of the analysis cache key.
+# Any new option read by the analyses must be added here.
+_RESULT_OPTION_KEYS = ('data_loaded', 'include_country_stats')
+
+# Analysis catalogue returned by get_available_analyses (read-only, shared across calls)
+_AVAILABLE_ANALYSES = (
+    MappingProxyType({
+        "type": "trend_analysis",
+        "name": "Análisis de Tendencias",
+        "description": "Analiza patrones temporales y tasas de crecimiento en los datos de pasajeros"
+    }),
+    MappingProxyType({
+        "type": "holiday_impact_analysis",
+        "name": "Análisis de Impacto de Feriados",
+        "description": "Estudia la correlación entre feriados y tráfico de pasajeros"
+    }),
+    MappingProxyType({
+        "type": "geographic_analysis",
+        "name": "Análisis Geográfico",
+        "description": "Analiza la distribución de datos entre diferentes países"
+    }),
+    MappingProxyType({
+        "type": "seasonal_analysis",
+        "name": "Análisis Estacional",
+        "description": "Identifica patrones estacionales en los datos"
+    }),
+    MappingProxyType({
+        "type": "statistical_analysis",
+        "name": "Análisis Estadístico",
+        "description": "Realiza estadísticas descriptivas y correlaciones"
+    }),
+    MappingProxyType({
+        "type": "comparison_analysis",
+        "name": "Análisis de Comparación",
+        "description": "Compara datos entre países, meses o períodos"
+    }),
+)
+
+
+# Narrative templates: constant prose formatted in one pass per section
+_COUNTRY_NARRATIVE_TMPL = (
+    "## 📊 Análisis de {country}\n\n"
+    "**Descubrimientos principales:**\n\n"
+    "• **Volumen de tráfico**: {country} registró un total de **{total_passengers:,.0f} pasajeros** durante el período analizado.\n\n"
+    "{monthly}{years}{holidays}{share}{trend}{seasonal}"
+)
+_COUNTRY_MONTHLY_TMPL = "• **Actividad mensual**: El país mantiene un promedio de **{:,.0f} pasajeros por mes**, mostrando una actividad aérea consistente.\n\n"
+_COUNTRY_YEARS_TMPL = "• **Período de análisis**: Los datos abarcan **{} años**, proporcionando una perspectiva temporal sólida.\n\n"
+_COUNTRY_HOLIDAYS_TMPL = "• **Feriados registrados**: Se identificaron **{} feriados** que podrían influir en los patrones de viaje.\n\n"
+_COUNTRY_SHARE_TMPL = "• **Importancia global**: {} representa el **{:.1f}%** del tráfico aéreo total analizado.\n\n"
+_COUNTRY_GROWTH_TMPL = "• **Tendencia positiva**: El país muestra un **crecimiento del {:.1%}** en el tráfico aéreo.\n\n"
+_COUNTRY_DECLINE_TMPL = "• **Tendencia negativa**: El país experimenta una **disminución del {:.1%}** en el tráfico aéreo.\n\n"
+_COUNTRY_SEASONAL_TMPL = "• **Patrones estacionales**: El mes de mayor actividad es **{}**, mientras que **{}** registra la menor actividad.\n\n"
+
+_GENERAL_NARRATIVE_TMPL = (
+    "## 🌍 Análisis General del Tráfico Aéreo\n\n"
+    "**Panorama general:**\n\n"
+    "• **Escala global**: El análisis abarca **{total_passengers:,.0f} pasajeros** en total, representando una muestra significativa del tráfico aéreo mundial.\n\n"
+    "{coverage}{holidays}{average}"
+)
+_GENERAL_COVERAGE_TMPL = "• **Cobertura geográfica**: Se analizaron **{} países**, proporcionando una visión comprehensiva de los patrones de viaje internacionales.\n\n"
+_GENERAL_HOLIDAYS_TMPL = "• **Impacto de feriados**: Se identificaron **{} feriados** que influyen en los patrones de viaje, mostrando la importancia de los eventos culturales y nacionales en el tráfico aéreo.\n\n"
+_GENERAL_AVERAGE_TMPL = "• **Distribución promedio**: Cada país registra un promedio de **{:,.0f} pasajeros**, indicando la diversidad en la actividad aérea entre regiones.\n\n"
+
+
+def _error_result(analysis_type: str, message: str) -> Mapping[str, Any]:
+    return MappingProxyType({"analysis_type": analysis_type, "error": True, "message": message})
+
+
+# Constant "no data" results, built once and shared across calls (read-only)
+_NO_PASSENGER_DATA = {
+    analysis_type: _error_result(analysis_type, f"No passenger data available for {label}")
+    for analysis_type, label in (
+        ("country_specific_analysis", "analysis"),
+        ("trend_analysis", "trend analysis"),
+        ("holiday_impact_analysis", "holiday impact analysis"),
+        ("geographic_analysis", "geographic analysis"),
+        ("seasonal_analysis", "seasonal analysis"),
+        ("statistical_analysis", "statistical analysis"),
+        ("comparison_analysis", "comparison analysis"),
+    )
+}
+_NO_HOLIDAY_DATA_ERROR = _error_result(
+    "holiday_impact_analysis", "No holiday data available for holiday impact analysis"
+)
 
 class SimpleDataAnalysisAgent:
     """
@@ -42,6 +247,24 @@ class SimpleDataAnalysisAgent:
         self.filters = Filters()
         self.visualizations = Visualizations()
         self.analysis_cache = {}
+        self._dispatch = {
+            'trend': self._analyze_trends,
+            'holiday': self._analyze_holiday_impact,
+            'geographic': self._analyze_geographic,
+            'seasonal': self._analyze_seasonal,
+            'statistical': self._analyze_statistical,
+            'comparison': self._analyze_comparison,
+        }
+        self._narratives = {
+            'country_specific_analysis': self._create_country_narrative,
+            'general_analysis': self._create_general_narrative,
+            'trend_analysis': self._create_trend_narrative,
+            'holiday_impact_analysis': self._create_holiday_narrative,
+            'geographic_analysis': self._create_geographic_narrative,
+            'seasonal_analysis': self._create_seasonal_narrative,
+            'statistical_analysis': self._create_statistical_narrative,
+            'comparison_analysis': self._create_comparison_narrative,
+        }
     
     def analyze_user_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -58,9 +281,30 @@ class SimpleDataAnalysisAgent:
             # Prepare context for the analysis
             agent_context = self._prepare_agent_context(context)
             
+            # Repeat queries over the same data, filters and options are served from the cache
+            cache_key = (
+                query.lower().strip(),
+                agent_context["_data_fingerprint"],
+                tuple(repr(agent_context.get(key)) for key in _RESULT_OPTION_KEYS),
+            )
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                # Callers get their own copy, stamped with this request's time
+                analysis_results = copy.deepcopy(cached)
+                data_summary = analysis_results.get("data_summary")
+                if data_summary and "analysis_timestamp" in data_summary:
+                    data_summary["analysis_timestamp"] = agent_context["_analysis_ts"]
+                return analysis_results
+            
             # Analyze the query
             analysis_results = self._analyze_query(query, agent_context)
             
+            if analysis_results.get("success"):
+                if len(self.analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+                    del self.analysis_cache[next(iter(self.analysis_cache))]
+                # Keep a private copy so callers can't alter later answers
+                self.analysis_cache[cache_key] = copy.deepcopy(analysis_results)
+            
             return analysis_results
             
         except Exception as e:
@@ -81,6 +325,8 @@ class SimpleDataAnalysisAgent:
         Returns:
             Dictionary containing prepared context
         """
+        # One timestamp per request, shared by every analysis built from this context
+        analysis_ts = datetime.now().isoformat()
         agent_context = {
             "data_loaded": False,
             "data": {},
@@ -100,7 +346,7 @@ class SimpleDataAnalysisAgent:
             agent_context["data"] = context.get("data", {})
             agent_context["data_loaded"] = True
             agent_context["current_filters"] = context.get("current_filters", {})
-            agent_context["analysis_timestamp"] = pd.Timestamp.now().isoformat()
+            agent_context["analysis_timestamp"] = analysis_ts
             
             # Debug: Show data details
             if agent_context["data"]:
@@ -128,6 +374,30 @@ class SimpleDataAnalysisAgent:
         if context:
             agent_context.update(context)
         
+        agent_context["_analysis_ts"] = analysis_ts
+        
+        # Global aggregates that don't depend on the analysed country, computed once per context
+        passengers_df = agent_context["data"].get("passengers") if agent_context["data"] else None
+        if passengers_df is not None and not passengers_df.empty:
+            agent_context["_total_passengers"] = float(_passenger_totals(passengers_df).sum())
+        else:
+            agent_context["_total_passengers"] = 0
+        holidays_df = agent_context["data"].get("holidays") if agent_context["data"] else None
+        if holidays_df is not None and not holidays_df.empty:
+            agent_context["_holiday_counts_by_iso"] = holidays_df['ISO3'].value_counts().to_dict()
+        else:
+            agent_context["_holiday_counts_by_iso"] = {}
+        
+        # Cheap identity of the analysed data; the frames are replaced, not mutated, on reload
+        agent_context["_data_fingerprint"] = (
+            id(passengers_df),
+            None if passengers_df is None else passengers_df.shape,
+            agent_context["_total_passengers"],
+            id(holidays_df),
+            None if holidays_df is None else len(holidays_df),
+            repr(agent_context.get("current_filters")),
+        )
+        
         return agent_context
     
     def _analyze_query(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -144,730 +414,587 @@ class SimpleDataAnalysisAgent:
         query_lower = query.lower()
         
         # Check for specific country mentions first
-        country_codes = {
-            'latvia': 'LVA', 'letonia': 'LVA', 'lva': 'LVA', 'lv': 'LVA',
-            'estonia': 'EST', 'estonia': 'EST', 'est': 'EST', 'ee': 'EST',
-            'lithuania': 'LTU', 'lituania': 'LTU', 'ltu': 'LTU', 'lt': 'LTU',
-            'spain': 'ESP', 'españa': 'ESP', 'esp': 'ESP', 'es': 'ESP',
-            'france': 'FRA', 'francia': 'FRA', 'fra': 'FRA', 'fr': 'FRA',
-            'germany': 'DEU', 'alemania': 'DEU', 'deu': 'DEU', 'de': 'DEU',
-            'italy': 'ITA', 'italia': 'ITA', 'ita': 'ITA', 'it': 'ITA',
-            'portugal': 'PRT', 'prt': 'PRT', 'pt': 'PRT',
-            'poland': 'POL', 'polonia': 'POL', 'pol': 'POL', 'pl': 'POL',
-            'czech': 'CZE', 'republica checa': 'CZE', 'cze': 'CZE', 'cz': 'CZE',
-            'slovakia': 'SVK', 'eslovaquia': 'SVK', 'svk': 'SVK', 'sk': 'SVK',
-            'hungary': 'HUN', 'hungria': 'HUN', 'hun': 'HUN', 'hu': 'HUN',
-            'romania': 'ROU', 'rumania': 'ROU', 'rou': 'ROU', 'ro': 'ROU',
-            'bulgaria': 'BGR', 'bulgaria': 'BGR', 'bgr': 'BGR', 'bg': 'BGR',
-            'croatia': 'HRV', 'croacia': 'HRV', 'hrv': 'HRV', 'hr': 'HRV',
-            'slovenia': 'SVN', 'eslovenia': 'SVN', 'svn': 'SVN', 'si': 'SVN',
-            'greece': 'GRC', 'grecia': 'GRC', 'grc': 'GRC', 'gr': 'GRC',
-            'cyprus': 'CYP', 'chipre': 'CYP', 'cyp': 'CYP', 'cy': 'CYP',
-            'malta': 'MLT', 'mlt': 'MLT', 'mt': 'MLT',
-            'luxembourg': 'LUX', 'luxemburgo': 'LUX', 'lux': 'LUX', 'lu': 'LUX',
-            'belgium': 'BEL', 'belgica': 'BEL', 'bel': 'BEL', 'be': 'BEL',
-            'netherlands': 'NLD', 'holanda': 'NLD', 'nld': 'NLD', 'nl': 'NLD',
-            'austria': 'AUT', 'austria': 'AUT', 'aut': 'AUT', 'at': 'AUT',
-            'switzerland': 'CHE', 'suiza': 'CHE', 'che': 'CHE', 'ch': 'CHE',
-            'denmark': 'DNK', 'dinamarca': 'DNK', 'dnk': 'DNK', 'dk': 'DNK',
-            'sweden': 'SWE', 'suecia': 'SWE', 'swe': 'SWE', 'se': 'SWE',
-            'finland': 'FIN', 'finlandia': 'FIN', 'fin': 'FIN', 'fi': 'FIN',
-            'norway': 'NOR', 'noruega': 'NOR', 'nor': 'NOR', 'no': 'NOR',
-            'iceland': 'ISL', 'islandia': 'ISL', 'isl': 'ISL', 'is': 'ISL',
-            'ireland': 'IRL', 'irlanda': 'IRL', 'irl': 'IRL', 'ie': 'IRL',
-            'united kingdom': 'GBR', 'reino unido': 'GBR', 'gbr': 'GBR', 'gb': 'GBR',
-            'united states': 'USA', 'estados unidos': 'USA', 'usa': 'USA', 'us': 'USA',
-            'canada': 'CAN', 'canada': 'CAN', 'can': 'CAN', 'ca': 'CAN',
-            'mexico': 'MEX', 'mexico': 'MEX', 'mex': 'MEX', 'mx': 'MEX'
-        }
-        
-        mentioned_country = None
-        for country_name, country_code in country_codes.items():
-            if country_name in query_lower:
-                mentioned_country = country_code
-                break
+        mentioned_country = _find_country(query_lower)
         
         # Determine analysis type based on query
         if mentioned_country:
             return self._analyze_country_specific(query, context, mentioned_country)
-        elif any(word in query_lower for word in ['tendencia', 'evolución', 'crecimiento', 'decrecimiento', 'cambio']):
-            return self._analyze_trends(query, context)
-        elif any(word in query_lower for word in ['feriado', 'holiday', 'impacto', 'efecto', 'influencia']):
-            return self._analyze_holiday_impact(query, context)
-        elif any(word in query_lower for word in ['país', 'países', 'región', 'geográfico', 'ubicación']):
-            return self._analyze_geographic(query, context)
-        elif any(word in query_lower for word in ['estacional', 'temporada', 'mes', 'año', 'período']):
-            return self._analyze_seasonal(query, context)
-        elif any(word in query_lower for word in ['estadística', 'promedio', 'mediana', 'desviación', 'correlación']):
-            return self._analyze_statistical(query, context)
-        elif any(word in query_lower for word in ['comparar', 'comparación', 'vs', 'versus', 'diferencia']):
-            return self._analyze_comparison(query, context)
-        else:
-            return self._analyze_general(query, context)
+        
+        matched = {match.lastgroup for match in _DISPATCH_RE.finditer(query_lower)}
+        for kind in _DISPATCH_PRIORITY:
+            if kind in matched:
+                return self._dispatch[kind](query, context)
+        return self._analyze_general(query, context)
     
     def _analyze_country_specific(self, query: str, context: Dict[str, Any], country_code: str) -> Dict[str, Any]:
         """Analyze data for a specific country."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            holidays_df = data.get('holidays')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "country_specific_analysis",
-                    "error": True,
-                    "message": f"No passenger data available for analysis"
-                }
-            
-            # Filter data for specific country
-            country_data = passengers_df[passengers_df['ISO3'] == country_code]
-            if country_data.empty:
-                return {
-                    "analysis_type": "country_specific_analysis",
-                    "error": True,
-                    "message": f"No data found for country code: {country_code}"
-                }
-            
-            # Calculate country-specific metrics
-            country_passengers = country_data['Total'].sum()
-            country_avg_monthly = country_data.groupby('Month')['Total'].mean().mean()
-            country_years = country_data['Year'].nunique()
-            country_months = country_data['Month'].nunique()
-            
-            # Get country holidays
-            country_holidays = 0
-            if holidays_df is not None and not holidays_df.empty:
-                country_holidays = len(holidays_df[holidays_df['ISO3'] == country_code])
-            
-            # Calculate growth rate
-            yearly_data = country_data.groupby('Year')['Total'].sum().reset_index()
-            growth_rate = self._calculate_growth_rate(yearly_data)
-            
-            # Get peak and low months
-            monthly_data = country_data.groupby('Month')['Total'].sum().reset_index()
-            if not monthly_data.empty:
-                peak_month = monthly_data.loc[monthly_data['Total'].idxmax()]
-                low_month = monthly_data.loc[monthly_data['Total'].idxmin()]
-                peak_month_name = self._get_month_name(peak_month['Month'])
-                low_month_name = self._get_month_name(low_month['Month'])
-            else:
-                peak_month_name = "N/A"
-                low_month_name = "N/A"
-            
-            # Calculate percentage of total
-            total_passengers = passengers_df['Total'].sum()
-            percentage_of_total = (country_passengers / total_passengers * 100) if total_passengers > 0 else 0
-            
-            # Generate insights
-            country_name = self._get_country_name(country_code)
-            insights = [
-                f"Análisis específico para {country_name} ({country_code})",
-                f"El país registró {country_passengers:,.0f} pasajeros en total",
-                f"Con un promedio mensual de {country_avg_monthly:,.0f} pasajeros",
-                f"Los datos abarcan {country_years} años de información",
-                f"Incluyendo {country_months} meses con datos disponibles",
-                f"Se identificaron {country_holidays} feriados que influyen en el tráfico",
-                f"Representando el {percentage_of_total:.1f}% del tráfico global",
-                f"Mostrando una tasa de crecimiento del {growth_rate:.1%}",
-                f"Con mayor actividad en {peak_month_name}",
-                f"Y menor actividad en {low_month_name}"
-            ]
-            
-            return {
-                "analysis_type": "country_specific_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "country": f"{country_name} ({country_code})",
-                    "country_passengers": country_passengers,
-                    "country_avg_monthly": country_avg_monthly,
-                    "country_years": country_years,
-                    "country_months": country_months,
-                    "country_holidays": country_holidays,
-                    "percentage_of_total": percentage_of_total,
-                    "growth_rate": growth_rate,
-                    "peak_month": peak_month_name,
-                    "low_month": low_month_name
-                },
-                "data_summary": {
-                    "data_loaded": context.get('data_loaded', False),
-                    "analysis_timestamp": pd.Timestamp.now().isoformat(),
-                    "country_analyzed": f"{country_name} ({country_code})"
-                },
-                "success": True
-            }
-            
-        except Exception as e:
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        holidays_df = data.get('holidays')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["country_specific_analysis"]
+        
+        # Filter data for specific country
+        country_data = passengers_df[passengers_df['ISO3'] == country_code]
+        if country_data.empty:
             return {
                 "analysis_type": "country_specific_analysis",
                 "error": True,
-                "message": f"Error in country-specific analysis: {str(e)}"
+                "message": f"No data found for country code: {country_code}"
             }
+        
+        # Calculate country-specific metrics
+        country_passengers = float(_passenger_totals(country_data).sum())
+        # Per-month sums and counts over the fixed 1-12 domain, shared by the monthly metrics below
+        month_sums = np.bincount(country_data['Month'].to_numpy(), weights=country_data['Total'].to_numpy(dtype=np.float64), minlength=13)
+        month_counts = np.bincount(country_data['Month'].to_numpy(), minlength=13)
+        present = month_counts > 0
+        # Mean of the per-month means, as groupby('Month').mean().mean()
+        country_avg_monthly = (month_sums[present] / month_counts[present]).mean()
+        country_years = country_data['Year'].nunique()
+        country_months = int(present.sum())
+        
+        # Get country holidays
+        holiday_counts = context.get('_holiday_counts_by_iso')
+        if holiday_counts is not None:
+            country_holidays = holiday_counts.get(country_code, 0)
+        elif holidays_df is not None and not holidays_df.empty:
+            country_holidays = len(holidays_df[holidays_df['ISO3'] == country_code])
+        else:
+            country_holidays = 0
+        
+        # Calculate growth rate
+        yearly_totals = _passenger_totals(country_data).groupby(country_data['Year']).sum()
+        growth_rate = self._calculate_growth_rate(yearly_totals.to_frame())
+        
+        # Get peak and low months
+        if present.any():
+            peak_month_name = self._get_month_name(int(np.where(present, month_sums, -np.inf).argmax()))
+            low_month_name = self._get_month_name(int(np.where(present, month_sums, np.inf).argmin()))
+        else:
+            peak_month_name = "N/A"
+            low_month_name = "N/A"
+        
+        # Calculate percentage of total
+        total_passengers = context.get('_total_passengers')
+        if total_passengers is None:
+            total_passengers = float(_passenger_totals(passengers_df).sum())
+        percentage_of_total = (country_passengers / total_passengers * 100) if total_passengers > 0 else 0
+        
+        # Generate insights
+        country_name = self._get_country_name(country_code)
+        insights = [
+            f"Análisis específico para {country_name} ({country_code})",
+            f"El país registró {country_passengers:,.0f} pasajeros en total",
+            f"Con un promedio mensual de {country_avg_monthly:,.0f} pasajeros",
+            f"Los datos abarcan {country_years} años de información",
+            f"Incluyendo {country_months} meses con datos disponibles",
+            f"Se identificaron {country_holidays} feriados que influyen en el tráfico",
+            f"Representando el {percentage_of_total:.1f}% del tráfico global",
+            f"Mostrando una tasa de crecimiento del {growth_rate:.1%}",
+            f"Con mayor actividad en {peak_month_name}",
+            f"Y menor actividad en {low_month_name}"
+        ]
+        
+        return {
+            "analysis_type": "country_specific_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "country": f"{country_name} ({country_code})",
+                "country_passengers": country_passengers,
+                "country_avg_monthly": country_avg_monthly,
+                "country_years": country_years,
+                "country_months": country_months,
+                "country_holidays": country_holidays,
+                "percentage_of_total": percentage_of_total,
+                "growth_rate": growth_rate,
+                "peak_month": peak_month_name,
+                "low_month": low_month_name
+            },
+            "data_summary": {
+                "data_loaded": context.get('data_loaded', False),
+                "analysis_timestamp": context.get('_analysis_ts') or datetime.now().isoformat(),
+                "country_analyzed": f"{country_name} ({country_code})"
+            },
+            "success": True
+        }
     
     def _analyze_trends(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze trends in the data."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "trend_analysis",
-                    "error": True,
-                    "message": "No passenger data available for trend analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-            
-            # Group by year and month for trend analysis
-            monthly_trends = passengers_df.groupby(['Year', 'Month'])['Total'].sum().reset_index()
-            monthly_trends['Date'] = pd.to_datetime(monthly_trends[['Year', 'Month']].assign(day=1))
-            
-            # Calculate trend metrics
-            total_passengers = monthly_trends['Total'].sum()
-            avg_monthly = monthly_trends['Total'].mean()
-            growth_rate = self._calculate_growth_rate(monthly_trends)
-            peak_period = monthly_trends.loc[monthly_trends['Total'].idxmax()]
-            low_period = monthly_trends.loc[monthly_trends['Total'].idxmin()]
-            
-            # Generate insights
-            insights = [
-                f"El total de pasajeros analizados es {total_passengers:,.0f}",
-                f"El promedio mensual es {avg_monthly:,.0f} pasajeros",
-                f"La tasa de crecimiento es {growth_rate:.1%}",
-                f"El período pico es {self._get_month_name(peak_period['Month'])} {int(peak_period['Year'])} con {peak_period['Total']:,.0f} pasajeros",
-                f"El período más bajo es {self._get_month_name(low_period['Month'])} {int(low_period['Year'])} con {low_period['Total']:,.0f} pasajeros"
-            ]
-            
-            return {
-                "analysis_type": "trend_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "total_passengers": total_passengers,
-                    "avg_monthly": avg_monthly,
-                    "growth_rate": growth_rate,
-                    "peak_period": peak_period.to_dict(),
-                    "low_period": low_period.to_dict()
-                },
-                "data_summary": {
-                    "period_analyzed": f"{monthly_trends['Year'].min()}-{monthly_trends['Year'].max()}",
-                    "months_analyzed": len(monthly_trends),
-                    "countries_analyzed": passengers_df['ISO3'].nunique()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "trend_analysis",
-                "error": True,
-                "message": f"Error in trend analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["trend_analysis"]
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+        
+        # Group by year and month for trend analysis (indexed by (Year, Month))
+        monthly_trends = _passenger_totals(passengers_df).groupby([passengers_df['Year'], passengers_df['Month']]).sum()
+        
+        # Calculate trend metrics
+        total_passengers = monthly_trends.sum()
+        avg_monthly = monthly_trends.mean()
+        growth_rate = self._calculate_growth_rate(monthly_trends.to_frame())
+        peak_year, peak_month = monthly_trends.idxmax()
+        low_year, low_month = monthly_trends.idxmin()
+        peak_period = {
+            'Year': peak_year, 'Month': peak_month, 'Total': monthly_trends.max(),
+            'Date': pd.Timestamp(year=int(peak_year), month=int(peak_month), day=1)
+        }
+        low_period = {
+            'Year': low_year, 'Month': low_month, 'Total': monthly_trends.min(),
+            'Date': pd.Timestamp(year=int(low_year), month=int(low_month), day=1)
+        }
+        years = monthly_trends.index.get_level_values('Year')
+        
+        # Generate insights
+        insights = [
+            f"El total de pasajeros analizados es {total_passengers:,.0f}",
+            f"El promedio mensual es {avg_monthly:,.0f} pasajeros",
+            f"La tasa de crecimiento es {growth_rate:.1%}",
+            f"El período pico es {self._get_month_name(peak_month)} {int(peak_year)} con {peak_period['Total']:,.0f} pasajeros",
+            f"El período más bajo es {self._get_month_name(low_month)} {int(low_year)} con {low_period['Total']:,.0f} pasajeros"
+        ]
+        
+        return {
+            "analysis_type": "trend_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "total_passengers": total_passengers,
+                "avg_monthly": avg_monthly,
+                "growth_rate": growth_rate,
+                "peak_period": peak_period,
+                "low_period": low_period
+            },
+            "data_summary": {
+                "period_analyzed": f"{years.min()}-{years.max()}",
+                "months_analyzed": len(monthly_trends),
+                "countries_analyzed": passengers_df['ISO3'].nunique()
+            },
+            "success": True
+        }
     
     def _analyze_holiday_impact(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze holiday impact on passenger traffic."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            holidays_df = data.get('holidays')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "holiday_impact_analysis",
-                    "error": True,
-                    "message": "No passenger data available for holiday impact analysis"
-                }
-            
-            if holidays_df is None or holidays_df.empty:
-                return {
-                    "analysis_type": "holiday_impact_analysis",
-                    "error": True,
-                    "message": "No holiday data available for holiday impact analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-                holidays_df = filtered_data.get('holidays', holidays_df)
-            
-            # Process holiday data
-            holidays_df['Date'] = pd.to_datetime(holidays_df['Date'])
-            holidays_df['Month'] = holidays_df['Date'].dt.month
-            holidays_df['Year'] = holidays_df['Date'].dt.year
-            
-            # Group holidays by month and year
-            holiday_counts = holidays_df.groupby(['Year', 'Month']).size().reset_index(name='HolidayCount')
-            
-            # Group passengers by month and year
-            passenger_monthly = passengers_df.groupby(['Year', 'Month'])['Total'].sum().reset_index()
-            
-            # Merge data
-            combined_data = pd.merge(passenger_monthly, holiday_counts, on=['Year', 'Month'], how='left')
-            combined_data['HolidayCount'] = combined_data['HolidayCount'].fillna(0)
-            
-            # Calculate correlation
-            correlation = combined_data['Total'].corr(combined_data['HolidayCount'])
-            
-            # Generate insights
-            insights = [
-                f"Se analizaron {len(holidays_df)} feriados en {holidays_df['ISO3'].nunique()} países",
-                f"La correlación entre feriados y pasajeros es {correlation:.3f}",
-                f"El mes con más feriados es {combined_data.loc[combined_data['HolidayCount'].idxmax(), 'Month']}",
-                f"El mes con menos feriados es {combined_data.loc[combined_data['HolidayCount'].idxmin(), 'Month']}"
-            ]
-            
-            return {
-                "analysis_type": "holiday_impact_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "correlation": correlation,
-                    "total_holidays": len(holidays_df),
-                    "countries_with_holidays": holidays_df['ISO3'].nunique(),
-                    "data_points": len(combined_data)
-                },
-                "data_summary": {
-                    "period_analyzed": f"{combined_data['Year'].min()}-{combined_data['Year'].max()}",
-                    "months_analyzed": len(combined_data),
-                    "avg_holidays_per_month": combined_data['HolidayCount'].mean()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "holiday_impact_analysis",
-                "error": True,
-                "message": f"Error in holiday impact analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        holidays_df = data.get('holidays')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["holiday_impact_analysis"]
+        
+        if holidays_df is None or holidays_df.empty:
+            return _NO_HOLIDAY_DATA_ERROR
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+            holidays_df = filtered_data.get('holidays', holidays_df)
+        
+        # Process holiday data
+        holidays_df['Date'] = pd.to_datetime(holidays_df['Date'])
+        holidays_df['Month'] = holidays_df['Date'].dt.month
+        holidays_df['Year'] = holidays_df['Date'].dt.year
+        
+        # Group passengers by month and year
+        passenger_monthly = _passenger_totals(passengers_df).groupby([passengers_df['Year'], passengers_df['Month']]).sum()
+        
+        # Align holiday counts onto the passenger (Year, Month) index instead of merging
+        holiday_counts = holidays_df.groupby(['Year', 'Month']).size().reindex(
+            passenger_monthly.index, fill_value=0
+        )
+        
+        # Calculate correlation
+        correlation = passenger_monthly.corr(holiday_counts)
+        years = passenger_monthly.index.get_level_values('Year')
+        
+        # Generate insights
+        insights = [
+            f"Se analizaron {len(holidays_df)} feriados en {holidays_df['ISO3'].nunique()} países",
+            f"La correlación entre feriados y pasajeros es {correlation:.3f}",
+            f"El mes con más feriados es {holiday_counts.idxmax()[1]}",
+            f"El mes con menos feriados es {holiday_counts.idxmin()[1]}"
+        ]
+        
+        return {
+            "analysis_type": "holiday_impact_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "correlation": correlation,
+                "total_holidays": len(holidays_df),
+                "countries_with_holidays": holidays_df['ISO3'].nunique(),
+                "data_points": len(passenger_monthly)
+            },
+            "data_summary": {
+                "period_analyzed": f"{years.min()}-{years.max()}",
+                "months_analyzed": len(passenger_monthly),
+                "avg_holidays_per_month": holiday_counts.mean()
+            },
+            "success": True
+        }
     
     def _analyze_geographic(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze geographic distribution of data."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "geographic_analysis",
-                    "error": True,
-                    "message": "No passenger data available for geographic analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-            
-            # Analyze by country
-            country_analysis = passengers_df.groupby('ISO3')['Total'].agg(['sum', 'mean', 'count']).reset_index()
-            country_analysis = country_analysis.sort_values('sum', ascending=False)
-            
-            # Get top countries
-            top_countries = country_analysis.head(10)
-            
-            # Generate insights
-            insights = [
-                f"Se analizaron {len(country_analysis)} países",
-                f"El país con más pasajeros es {top_countries.iloc[0]['ISO3']} con {top_countries.iloc[0]['sum']:,.0f}",
-                f"El país con menos pasajeros es {country_analysis.iloc[-1]['ISO3']} con {country_analysis.iloc[-1]['sum']:,.0f}",
-                f"Los top 5 países representan {top_countries.head(5)['sum'].sum() / country_analysis['sum'].sum():.1%} del total"
-            ]
-            
-            return {
-                "analysis_type": "geographic_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "total_countries": len(country_analysis),
-                    "top_countries": top_countries.to_dict('records'),
-                    "total_passengers": country_analysis['sum'].sum(),
-                    "avg_per_country": country_analysis['sum'].mean()
-                },
-                "data_summary": {
-                    "countries_analyzed": len(country_analysis),
-                    "total_passengers": country_analysis['sum'].sum(),
-                    "avg_per_country": country_analysis['sum'].mean()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "geographic_analysis",
-                "error": True,
-                "message": f"Error in geographic analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["geographic_analysis"]
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+        
+        # Analyze by country
+        country_analysis = _passenger_totals(passengers_df).groupby(passengers_df['ISO3']).agg(['sum', 'mean', 'count']).reset_index()
+        
+        # Only the top 10 and the bottom row are needed, so select them without a full sort
+        top_countries = country_analysis.nlargest(10, 'sum').to_dict('records')
+        top_row = top_countries[0]
+        bottom_row = country_analysis.nsmallest(1, 'sum', keep='last').iloc[0].to_dict()
+        total_passengers = country_analysis['sum'].sum()
+        avg_per_country = country_analysis['sum'].mean()
+        top5_share = sum(row['sum'] for row in top_countries[:5]) / total_passengers
+        
+        # Generate insights
+        insights = [
+            f"Se analizaron {len(country_analysis)} países",
+            f"El país con más pasajeros es {top_row['ISO3']} con {top_row['sum']:,.0f}",
+            f"El país con menos pasajeros es {bottom_row['ISO3']} con {bottom_row['sum']:,.0f}",
+            f"Los top 5 países representan {top5_share:.1%} del total"
+        ]
+        
+        return {
+            "analysis_type": "geographic_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "total_countries": len(country_analysis),
+                "top_countries": top_countries,
+                "total_passengers": total_passengers,
+                "avg_per_country": avg_per_country
+            },
+            "data_summary": {
+                "countries_analyzed": len(country_analysis),
+                "total_passengers": total_passengers,
+                "avg_per_country": avg_per_country
+            },
+            "success": True
+        }
     
     def _analyze_seasonal(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze seasonal patterns in the data."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "seasonal_analysis",
-                    "error": True,
-                    "message": "No passenger data available for seasonal analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-            
-            # Group by month for seasonal analysis
-            seasonal_data = passengers_df.groupby('Month')['Total'].agg(['sum', 'mean', 'std']).reset_index()
-            seasonal_data['MonthName'] = seasonal_data['Month'].apply(self._get_month_name)
-            
-            # Calculate seasonal metrics
-            peak_month = seasonal_data.loc[seasonal_data['sum'].idxmax()]
-            low_month = seasonal_data.loc[seasonal_data['sum'].idxmin()]
-            seasonal_variation = (seasonal_data['sum'].max() - seasonal_data['sum'].min()) / seasonal_data['sum'].mean()
-            
-            # Generate insights
-            insights = [
-                f"El mes pico es {peak_month['MonthName']} con {peak_month['sum']:,.0f} pasajeros",
-                f"El mes más bajo es {low_month['MonthName']} con {low_month['sum']:,.0f} pasajeros",
-                f"La variación estacional es {seasonal_variation:.1%}",
-                f"El promedio de pasajeros por mes es {seasonal_data['sum'].mean():,.0f}"
-            ]
-            
-            return {
-                "analysis_type": "seasonal_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "peak_month": peak_month.to_dict(),
-                    "low_month": low_month.to_dict(),
-                    "seasonal_variation": seasonal_variation,
-                    "monthly_stats": seasonal_data.to_dict('records')
-                },
-                "data_summary": {
-                    "months_analyzed": len(seasonal_data),
-                    "total_passengers": seasonal_data['sum'].sum(),
-                    "avg_per_month": seasonal_data['sum'].mean()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "seasonal_analysis",
-                "error": True,
-                "message": f"Error in seasonal analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["seasonal_analysis"]
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+        
+        # Group by month for seasonal analysis
+        seasonal_data = _passenger_totals(passengers_df).groupby(passengers_df['Month']).agg(['sum', 'mean', 'std']).reset_index()
+        seasonal_data['MonthName'] = seasonal_data['Month'].apply(self._get_month_name)
+        
+        # Calculate seasonal metrics
+        peak_month = seasonal_data.loc[seasonal_data['sum'].idxmax()]
+        low_month = seasonal_data.loc[seasonal_data['sum'].idxmin()]
+        seasonal_variation = (seasonal_data['sum'].max() - seasonal_data['sum'].min()) / seasonal_data['sum'].mean()
+        
+        # Generate insights
+        insights = [
+            f"El mes pico es {peak_month['MonthName']} con {peak_month['sum']:,.0f} pasajeros",
+            f"El mes más bajo es {low_month['MonthName']} con {low_month['sum']:,.0f} pasajeros",
+            f"La variación estacional es {seasonal_variation:.1%}",
+            f"El promedio de pasajeros por mes es {seasonal_data['sum'].mean():,.0f}"
+        ]
+        
+        return {
+            "analysis_type": "seasonal_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "peak_month": peak_month.to_dict(),
+                "low_month": low_month.to_dict(),
+                "seasonal_variation": seasonal_variation,
+                "monthly_stats": seasonal_data.to_dict('records')
+            },
+            "data_summary": {
+                "months_analyzed": len(seasonal_data),
+                "total_passengers": seasonal_data['sum'].sum(),
+                "avg_per_month": seasonal_data['sum'].mean()
+            },
+            "success": True
+        }
     
     def _analyze_statistical(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Perform statistical analysis on the data."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "statistical_analysis",
-                    "error": True,
-                    "message": "No passenger data available for statistical analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-            
-            # Calculate descriptive statistics
-            stats = passengers_df['Total'].describe()
-            
-            # Calculate additional metrics
-            median = passengers_df['Total'].median()
-            mode = passengers_df['Total'].mode().iloc[0] if not passengers_df['Total'].mode().empty else 0
-            skewness = passengers_df['Total'].skew()
-            kurtosis = passengers_df['Total'].kurtosis()
-            
-            # Generate insights
-            insights = [
-                f"El promedio de pasajeros es {stats['mean']:,.0f}",
-                f"La mediana es {median:,.0f}",
-                f"La moda es {mode:,.0f}",
-                f"La desviación estándar es {stats['std']:,.0f}",
-                f"El rango es {stats['max'] - stats['min']:,.0f}",
-                f"La asimetría es {skewness:.3f}",
-                f"La curtosis es {kurtosis:.3f}"
-            ]
-            
-            return {
-                "analysis_type": "statistical_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "descriptive_stats": stats.to_dict(),
-                    "median": median,
-                    "mode": mode,
-                    "skewness": skewness,
-                    "kurtosis": kurtosis
-                },
-                "data_summary": {
-                    "total_records": len(passengers_df),
-                    "total_passengers": passengers_df['Total'].sum(),
-                    "countries_analyzed": passengers_df['ISO3'].nunique()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "statistical_analysis",
-                "error": True,
-                "message": f"Error in statistical analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["statistical_analysis"]
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+        
+        # Calculate descriptive statistics
+        totals = _passenger_totals(passengers_df)
+        stats = totals.describe()
+        
+        # Calculate additional metrics
+        median = float(totals.median())
+        mode = float(totals.mode().iloc[0]) if not totals.mode().empty else 0
+        skewness = float(totals.skew())
+        kurtosis = float(totals.kurtosis())
+        
+        # Generate insights
+        insights = [
+            f"El promedio de pasajeros es {stats['mean']:,.0f}",
+            f"La mediana es {median:,.0f}",
+            f"La moda es {mode:,.0f}",
+            f"La desviación estándar es {stats['std']:,.0f}",
+            f"El rango es {stats['max'] - stats['min']:,.0f}",
+            f"La asimetría es {skewness:.3f}",
+            f"La curtosis es {kurtosis:.3f}"
+        ]
+        
+        return {
+            "analysis_type": "statistical_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "descriptive_stats": stats.to_dict(),
+                "median": median,
+                "mode": mode,
+                "skewness": skewness,
+                "kurtosis": kurtosis
+            },
+            "data_summary": {
+                "total_records": len(passengers_df),
+                "total_passengers": float(_passenger_totals(passengers_df).sum()),
+                "countries_analyzed": passengers_df['ISO3'].nunique()
+            },
+            "success": True
+        }
     
     def _analyze_comparison(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze comparison between different entities."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            
-            if passengers_df is None or passengers_df.empty:
-                return {
-                    "analysis_type": "comparison_analysis",
-                    "error": True,
-                    "message": "No passenger data available for comparison analysis"
-                }
-            
-            # Apply filters if available
-            if context.get('current_filters'):
-                filtered_data = self.filters.apply_filters(data, context['current_filters'])
-                passengers_df = filtered_data.get('passengers', passengers_df)
-            
-            # Analyze by country
-            country_analysis = passengers_df.groupby('ISO3')['Total'].agg(['sum', 'mean', 'count']).reset_index()
-            country_analysis = country_analysis.sort_values('sum', ascending=False)
-            
-            # Get top countries
-            top_countries = country_analysis.head(10)
-            
-            # Generate insights
-            insights = [
-                f"Se analizaron {len(country_analysis)} países",
-                f"El país con más pasajeros es {top_countries.iloc[0]['ISO3']} con {top_countries.iloc[0]['sum']:,.0f}",
-                f"El país con menos pasajeros es {country_analysis.iloc[-1]['ISO3']} con {country_analysis.iloc[-1]['sum']:,.0f}",
-                f"La diferencia entre el país con más y menos pasajeros es {top_countries.iloc[0]['sum'] - country_analysis.iloc[-1]['sum']:,.0f}"
-            ]
-            
-            return {
-                "analysis_type": "comparison_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "total_countries": len(country_analysis),
-                    "top_country": top_countries.iloc[0].to_dict(),
-                    "bottom_country": country_analysis.iloc[-1].to_dict(),
-                    "country_stats": country_analysis.to_dict('records')
-                },
-                "data_summary": {
-                    "countries_analyzed": len(country_analysis),
-                    "total_passengers": country_analysis['sum'].sum(),
-                    "avg_per_country": country_analysis['sum'].mean()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "comparison_analysis",
-                "error": True,
-                "message": f"Error in comparison analysis: {str(e)}"
-            }
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        
+        if passengers_df is None or passengers_df.empty:
+            return _NO_PASSENGER_DATA["comparison_analysis"]
+        
+        # Apply filters if available
+        if context.get('current_filters'):
+            filtered_data = self.filters.apply_filters(data, context['current_filters'])
+            passengers_df = filtered_data.get('passengers', passengers_df)
+        
+        # Analyze by country in a single aggregation pass
+        country_analysis = (
+            _passenger_totals(passengers_df)
+            .groupby(passengers_df['ISO3'], sort=False, observed=True)
+            .agg(['sum', 'mean', 'count'])
+            .reset_index()
+            .sort_values('sum', ascending=False, kind='stable')
+        )
+        
+        # Derive totals from the aggregated sums (one value per country)
+        top_country = country_analysis.iloc[0].to_dict()
+        bottom_country = country_analysis.iloc[-1].to_dict()
+        total_passengers = country_analysis['sum'].to_numpy().sum()
+        avg_per_country = total_passengers / len(country_analysis)
+        
+        # Generate insights
+        insights = [
+            f"Se analizaron {len(country_analysis)} países",
+            f"El país con más pasajeros es {top_country['ISO3']} con {top_country['sum']:,.0f}",
+            f"El país con menos pasajeros es {bottom_country['ISO3']} con {bottom_country['sum']:,.0f}",
+            f"La diferencia entre el país con más y menos pasajeros es {top_country['sum'] - bottom_country['sum']:,.0f}"
+        ]
+        
+        metrics = {
+            "total_countries": len(country_analysis),
+            "top_country": top_country,
+            "bottom_country": bottom_country
+        }
+        # Serialising every country is the costliest step; callers can opt out
+        if context.get('include_country_stats', True):
+            metrics["country_stats"] = country_analysis.to_dict('records')
+        
+        return {
+            "analysis_type": "comparison_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": metrics,
+            "data_summary": {
+                "countries_analyzed": len(country_analysis),
+                "total_passengers": total_passengers,
+                "avg_per_country": avg_per_country
+            },
+            "success": True
+        }
     
     def _analyze_general(self, query: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """Perform general analysis on the data."""
-        try:
-            data = context.get('data', {})
-            passengers_df = data.get('passengers')
-            holidays_df = data.get('holidays')
-            countries_df = data.get('countries')
-            
-            # Calculate general metrics
-            total_passengers = passengers_df['Total'].sum() if passengers_df is not None and not passengers_df.empty else 0
-            total_holidays = len(holidays_df) if holidays_df is not None and not holidays_df.empty else 0
-            countries_analyzed = passengers_df['ISO3'].nunique() if passengers_df is not None and not passengers_df.empty else 0
-            
-            # Check if query mentions specific country
-            query_lower = query.lower()
-            country_mentioned = None
-            for country_code in ['latvia', 'letonia', 'lva', 'lv']:
-                if country_code in query_lower:
-                    country_mentioned = 'LVA'
-                    break
-            
-            # If specific country mentioned, provide country-specific analysis
-            if country_mentioned and passengers_df is not None and not passengers_df.empty:
-                country_data = passengers_df[passengers_df['ISO3'] == country_mentioned]
-                if not country_data.empty:
-                    country_passengers = country_data['Total'].sum()
-                    country_avg_monthly = country_data.groupby('Month')['Total'].mean().mean()
-                    country_years = country_data['Year'].nunique()
-                    
-                    # Get country holidays
+        data = context.get('data', {})
+        passengers_df = data.get('passengers')
+        holidays_df = data.get('holidays')
+        countries_df = data.get('countries')
+        
+        has_passengers = passengers_df is not None and not passengers_df.empty
+        
+        # Extract the columns once; every metric below works on these arrays.
+        # factorize reuses the codes directly when ISO3 is already categorical.
+        if has_passengers:
+            iso_codes, iso_names = pd.factorize(passengers_df['ISO3'])
+            totals = passengers_df['Total'].to_numpy(dtype=np.float64)
+            years = passengers_df['Year'].to_numpy()
+            months = passengers_df['Month'].to_numpy()
+            # Per-country sums in one compiled pass, shared by the country total and the top 3
+            valid = iso_codes >= 0
+            country_sums = np.bincount(iso_codes[valid], weights=totals[valid], minlength=len(iso_names))
+        
+        # Calculate general metrics
+        total_passengers = context.get('_total_passengers')
+        if total_passengers is None:
+            total_passengers = float(totals.sum()) if has_passengers else 0
+        total_holidays = len(holidays_df) if holidays_df is not None and not holidays_df.empty else 0
+        countries_analyzed = len(iso_names) if has_passengers else 0
+        
+        # Check if query mentions specific country
+        country_mentioned = _find_country(query.lower())
+        
+        # If specific country mentioned, provide country-specific analysis
+        if country_mentioned and has_passengers:
+            # Compare small-int factor codes instead of ISO3 strings (-1 when absent)
+            country_idx = iso_names.get_indexer([country_mentioned])[0]
+            mask = iso_codes == country_idx
+            if country_idx >= 0 and mask.any():
+                country_totals = totals[mask]
+                country_months = months[mask]
+                country_passengers = country_sums[country_idx]
+                # Mean of the per-month means, as groupby('Month').mean().mean()
+                month_sums = np.bincount(country_months, weights=country_totals)
+                month_counts = np.bincount(country_months)
+                present = month_counts > 0
+                country_avg_monthly = (month_sums[present] / month_counts[present]).mean()
+                country_years = np.unique(years[mask]).size
+                
+                # Get country holidays
+                holiday_counts = context.get('_holiday_counts_by_iso')
+                if holiday_counts is not None:
+                    country_holidays = holiday_counts.get(country_mentioned, 0)
+                elif holidays_df is not None and not holidays_df.empty:
+                    country_holidays = len(holidays_df[holidays_df['ISO3'] == country_mentioned])
+                else:
                     country_holidays = 0
-                    if holidays_df is not None and not holidays_df.empty:
-                        country_holidays = len(holidays_df[holidays_df['ISO3'] == country_mentioned])
-                    
-                    insights = [
-                        f"**Análisis específico para Letonia (LVA):**",
-                        f"Total de pasajeros: {country_passengers:,.0f}",
-                        f"Promedio mensual: {country_avg_monthly:,.0f} pasajeros",
-                        f"Años analizados: {country_years}",
-                        f"Feriados registrados: {country_holidays}",
-                        f"Representa el {country_passengers/total_passengers*100:.1f}% del total de pasajeros" if total_passengers > 0 else "No hay datos de comparación"
-                    ]
-                    
-                    return {
-                        "analysis_type": "country_specific_analysis",
-                        "query": query,
-                        "insights": insights,
-                        "metrics": {
-                            "country": "Letonia (LVA)",
-                            "country_passengers": country_passengers,
-                            "country_avg_monthly": country_avg_monthly,
-                            "country_years": country_years,
-                            "country_holidays": country_holidays,
-                            "percentage_of_total": country_passengers/total_passengers*100 if total_passengers > 0 else 0
-                        },
-                        "data_summary": {
-                            "data_loaded": context.get('data_loaded', False),
-                            "analysis_timestamp": pd.Timestamp.now().isoformat(),
-                            "country_analyzed": "Letonia (LVA)"
-                        },
-                        "success": True
-                    }
-            
-            # General analysis for all data
-            insights = [
-                f"El análisis abarca {total_passengers:,.0f} pasajeros en total",
-                f"Identificando {total_holidays} feriados que influyen en el tráfico",
-                f"Cubriendo {countries_analyzed} países diferentes",
-                f"Con un promedio de {total_passengers / countries_analyzed:,.0f} pasajeros por país" if countries_analyzed > 0 else "Sin datos de países disponibles"
-            ]
-            
-            # Add more specific insights if data is available
-            if passengers_df is not None and not passengers_df.empty:
-                year_range = f"{passengers_df['Year'].min()}-{passengers_df['Year'].max()}"
-                insights.append(f"Período de análisis: {year_range}")
                 
-                # Top countries
-                top_countries = passengers_df.groupby('ISO3')['Total'].sum().sort_values(ascending=False).head(3)
-                if not top_countries.empty:
-                    top_countries_str = ", ".join([f"{country} ({passengers:,.0f})" for country, passengers in top_countries.items()])
-                    insights.append(f"Los países con mayor tráfico son: {top_countries_str}")
-            
-            return {
-                "analysis_type": "general_analysis",
-                "query": query,
-                "insights": insights,
-                "metrics": {
-                    "total_passengers": total_passengers,
-                    "total_holidays": total_holidays,
-                    "countries_analyzed": countries_analyzed
-                },
-                "data_summary": {
-                    "data_loaded": context.get('data_loaded', False),
-                    "analysis_timestamp": pd.Timestamp.now().isoformat()
-                },
-                "success": True
-            }
-            
-        except Exception as e:
-            return {
-                "analysis_type": "general_analysis",
-                "error": True,
-                "message": f"Error in general analysis: {str(e)}"
-            }
+                country_label = f"{_ISO3_TO_NAME.get(country_mentioned, country_mentioned)} ({country_mentioned})"
+                insights = [
+                    f"**Análisis específico para {country_label}:**",
+                    f"Total de pasajeros: {country_passengers:,.0f}",
+                    f"Promedio mensual: {country_avg_monthly:,.0f} pasajeros",
+                    f"Años analizados: {country_years}",
+                    f"Feriados registrados: {country_holidays}",
+                    f"Representa el {country_passengers/total_passengers*100:.1f}% del total de pasajeros" if total_passengers > 0 else "No hay datos de comparación"
+                ]
+                
+                return {
+                    "analysis_type": "country_specific_analysis",
+                    "query": query,
+                    "insights": insights,
+                    "metrics": {
+                        "country": country_label,
+                        "country_passengers": country_passengers,
+                        "country_avg_monthly": country_avg_monthly,
+                        "country_years": country_years,
+                        "country_holidays": country_holidays,
+                        "percentage_of_total": country_passengers/total_passengers*100 if total_passengers > 0 else 0
+                    },
+                    "data_summary": {
+                        "data_loaded": context.get('data_loaded', False),
+                        "analysis_timestamp": context.get('_analysis_ts') or datetime.now().isoformat(),
+                        "country_analyzed": country_label
+                    },
+                    "success": True
+                }
+        
+        # General analysis for all data
+        insights = [
+            f"El análisis abarca {total_passengers:,.0f} pasajeros en total",
+            f"Identificando {total_holidays} feriados que influyen en el tráfico",
+            f"Cubriendo {countries_analyzed} países diferentes",
+            f"Con un promedio de {total_passengers / countries_analyzed:,.0f} pasajeros por país" if countries_analyzed > 0 else "Sin datos de países disponibles"
+        ]
+        
+        # Add more specific insights if data is available
+        if has_passengers:
+            year_range = f"{years.min()}-{years.max()}"
+            insights.append(f"Período de análisis: {year_range}")
+            
+            # Top countries: partial selection of the top 3 over the per-country sums
+            top_n = min(3, len(country_sums))
+            if top_n > 0:
+                top_idx = np.argpartition(-country_sums, top_n - 1)[:top_n]
+                top_idx = top_idx[np.argsort(-country_sums[top_idx], kind='stable')]
+                top_countries_str = ", ".join([f"{iso_names[i]} ({country_sums[i]:,.0f})" for i in top_idx])
+                insights.append(f"Los países con mayor tráfico son: {top_countries_str}")
+        
+        return {
+            "analysis_type": "general_analysis",
+            "query": query,
+            "insights": insights,
+            "metrics": {
+                "total_passengers": total_passengers,
+                "total_holidays": total_holidays,
+                "countries_analyzed": countries_analyzed
+            },
+            "data_summary": {
+                "data_loaded": context.get('data_loaded', False),
+                "analysis_timestamp": context.get('_analysis_ts') or datetime.now().isoformat()
+            },
+            "success": True
+        }
     
     def _calculate_growth_rate(self, data: pd.DataFrame) -> float:
         """Calculate growth rate from time series data."""
-        try:
-            if len(data) < 2:
-                return 0.0
-            
-            first_value = data['Total'].iloc[0]
-            last_value = data['Total'].iloc[-1]
-            
-            if first_value == 0:
-                return 0.0
-            
-            return (last_value - first_value) / first_value
-        except:
+        if 'Total' not in data:
+            return 0.0
+        
+        values = data['Total'].to_numpy()
+        if values.size < 2 or values[0] == 0:
             return 0.0
+        
+        return float((values[-1] - values[0]) / values[0])
     
     def _get_month_name(self, month_num: int) -> str:
         """Get month name from month number."""
-        month_names = {
-            1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-            5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-            9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-        }
-        return month_names.get(month_num, f'Mes {month_num}')
+        return _MONTH_NAMES.get(month_num, f'Mes {month_num}')
     
     def _get_country_name(self, country_code: str) -> str:
         """Get country name from country code."""
-        country_names = {
-            'LVA': 'Letonia', 'EST': 'Estonia', 'LTU': 'Lituania',
-            'ESP': 'España', 'FRA': 'Francia', 'DEU': 'Alemania',
-            'ITA': 'Italia', 'PRT': 'Portugal', 'POL': 'Polonia',
-            'CZE': 'República Checa', 'SVK': 'Eslovaquia', 'HUN': 'Hungría',
-            'ROU': 'Rumania', 'BGR': 'Bulgaria', 'HRV': 'Croacia',
-            'SVN': 'Eslovenia', 'GRC': 'Grecia', 'CYP': 'Chipre',
-            'MLT': 'Malta', 'LUX': 'Luxemburgo', 'BEL': 'Bélgica',
-            'NLD': 'Países Bajos', 'AUT': 'Austria', 'CHE': 'Suiza',
-            'DNK': 'Dinamarca', 'SWE': 'Suecia', 'FIN': 'Finlandia',
-            'NOR': 'Noruega', 'ISL': 'Islandia', 'IRL': 'Irlanda',
-            'GBR': 'Reino Unido', 'USA': 'Estados Unidos', 'CAN': 'Canadá',
-            'MEX': 'México'
-        }
-        return country_names.get(country_code, country_code)
+        return _ISO3_TO_NAME.get(country_code, country_code)
     
-    def get_available_analyses(self) -> List[Dict[str, str]]:
+    def get_available_analyses(self) -> Tuple[Mapping[str, str], ...]:
         """Get list of available analysis types."""
-        return [
-            {
-                "type": "trend_analysis",
-                "name": "Análisis de Tendencias",
-                "description": "Analiza patrones temporales y tasas de crecimiento en los datos de pasajeros"
-            },
-            {
-                "type": "holiday_impact_analysis",
-                "name": "Análisis de Impacto de Feriados",
-                "description": "Estudia la correlación entre feriados y tráfico de pasajeros"
-            },
-            {
-                "type": "geographic_analysis",
-                "name": "Análisis Geográfico",
-                "description": "Analiza la distribución de datos entre diferentes países"
-            },
-            {
-                "type": "seasonal_analysis",
-                "name": "Análisis Estacional",
-                "description": "Identifica patrones estacionales en los datos"
-            },
-            {
-                "type": "statistical_analysis",
-                "name": "Análisis Estadístico",
-                "description": "Realiza estadísticas descriptivas y correlaciones"
-            },
-            {
-                "type": "comparison_analysis",
-                "name": "Análisis de Comparación",
-                "description": "Compara datos entre países, meses o períodos"
-            }
-        ]
+        return _AVAILABLE_ANALYSES
     
     def get_analysis_summary(self, analysis_results: Dict[str, Any]) -> str:
         """Get a formatted summary of the analysis results."""
@@ -875,8 +1002,8 @@ class SimpleDataAnalysisAgent:
         if isinstance(analysis_results, str):
             return analysis_results
         
-        # Handle case where analysis_results is not a dict
-        if not isinstance(analysis_results, dict):
+        # Handle case where analysis_results is not a mapping (error results are read-only mappings)
+        if not isinstance(analysis_results, Mapping):
             return f"❌ Error: Resultado de análisis en formato inesperado: {type(analysis_results)}"
         
         if analysis_results.get("error", False):
@@ -887,24 +1014,8 @@ class SimpleDataAnalysisAgent:
         metrics = analysis_results.get("metrics", {})
         
         # Create narrative summary based on analysis type
-        if analysis_type == "country_specific_analysis":
-            return self._create_country_narrative(insights, metrics)
-        elif analysis_type == "general_analysis":
-            return self._create_general_narrative(insights, metrics)
-        elif analysis_type == "trend_analysis":
-            return self._create_trend_narrative(insights, metrics)
-        elif analysis_type == "holiday_impact_analysis":
-            return self._create_holiday_narrative(insights, metrics)
-        elif analysis_type == "geographic_analysis":
-            return self._create_geographic_narrative(insights, metrics)
-        elif analysis_type == "seasonal_analysis":
-            return self._create_seasonal_narrative(insights, metrics)
-        elif analysis_type == "statistical_analysis":
-            return self._create_statistical_narrative(insights, metrics)
-        elif analysis_type == "comparison_analysis":
-            return self._create_comparison_narrative(insights, metrics)
-        else:
-            return self._create_default_narrative(insights, metrics)
+        narrative = self._narratives.get(analysis_type, self._create_default_narrative)
+        return narrative(insights, metrics)
     
     def _create_country_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for country-specific analysis."""
@@ -918,41 +1029,32 @@ class SimpleDataAnalysisAgent:
         peak_month = metrics.get("peak_month", "N/A")
         low_month = metrics.get("low_month", "N/A")
         
-        narrative = f"## 📊 Análisis de {country}\n\n"
-        
-        # Main findings
-        narrative += f"**Descubrimientos principales:**\n\n"
-        narrative += f"• **Volumen de tráfico**: {country} registró un total de **{total_passengers:,.0f} pasajeros** durante el período analizado.\n\n"
-        
-        if avg_monthly > 0:
-            narrative += f"• **Actividad mensual**: El país mantiene un promedio de **{avg_monthly:,.0f} pasajeros por mes**, mostrando una actividad aérea consistente.\n\n"
-        
-        if years_analyzed > 0:
-            narrative += f"• **Período de análisis**: Los datos abarcan **{years_analyzed} años**, proporcionando una perspectiva temporal sólida.\n\n"
-        
-        if holidays > 0:
-            narrative += f"• **Feriados registrados**: Se identificaron **{holidays} feriados** que podrían influir en los patrones de viaje.\n\n"
-        
-        if percentage > 0:
-            narrative += f"• **Importancia global**: {country} representa el **{percentage:.1f}%** del tráfico aéreo total analizado.\n\n"
-        
-        if growth_rate != 0:
-            if growth_rate > 0:
-                narrative += f"• **Tendencia positiva**: El país muestra un **crecimiento del {growth_rate:.1%}** en el tráfico aéreo.\n\n"
-            else:
-                narrative += f"• **Tendencia negativa**: El país experimenta una **disminución del {abs(growth_rate):.1%}** en el tráfico aéreo.\n\n"
-        
-        if peak_month != "N/A" and low_month != "N/A":
-            narrative += f"• **Patrones estacionales**: El mes de mayor actividad es **{peak_month}**, mientras que **{low_month}** registra la menor actividad.\n\n"
+        sections = {
+            "country": country,
+            "total_passengers": total_passengers,
+            "monthly": _COUNTRY_MONTHLY_TMPL.format(avg_monthly) if avg_monthly > 0 else "",
+            "years": _COUNTRY_YEARS_TMPL.format(years_analyzed) if years_analyzed > 0 else "",
+            "holidays": _COUNTRY_HOLIDAYS_TMPL.format(holidays) if holidays > 0 else "",
+            "share": _COUNTRY_SHARE_TMPL.format(country, percentage) if percentage > 0 else "",
+            "trend": (
+                "" if growth_rate == 0
+                else _COUNTRY_GROWTH_TMPL.format(growth_rate) if growth_rate > 0
+                else _COUNTRY_DECLINE_TMPL.format(abs(growth_rate))
+            ),
+            "seasonal": (
+                _COUNTRY_SEASONAL_TMPL.format(peak_month, low_month)
+                if peak_month != "N/A" and low_month != "N/A" else ""
+            ),
+        }
+        parts = [_COUNTRY_NARRATIVE_TMPL.format_map(sections)]
         
         # Additional insights
         if insights:
-            narrative += "**Observaciones adicionales:**\n\n"
-            for insight in insights[1:]:  # Skip the first insight as it's already covered
-                if "**" not in insight:  # Skip formatted insights
-                    narrative += f"• {insight}\n"
+            parts.append("**Observaciones adicionales:**\n\n")
+            # Skip the first insight (already covered) and pre-formatted ones
+            parts.extend(f"• {insight}\n" for insight in insights[1:] if "**" not in insight)
         
-        return narrative
+        return "".join(parts)
     
     def _create_general_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for general analysis."""
@@ -960,106 +1062,65 @@ class SimpleDataAnalysisAgent:
         total_holidays = metrics.get("total_holidays", 0)
         countries_analyzed = metrics.get("countries_analyzed", 0)
         
-        narrative = "## 🌍 Análisis General del Tráfico Aéreo\n\n"
-        
-        narrative += f"**Panorama general:**\n\n"
-        narrative += f"• **Escala global**: El análisis abarca **{total_passengers:,.0f} pasajeros** en total, representando una muestra significativa del tráfico aéreo mundial.\n\n"
-        
-        if countries_analyzed > 0:
-            narrative += f"• **Cobertura geográfica**: Se analizaron **{countries_analyzed} países**, proporcionando una visión comprehensiva de los patrones de viaje internacionales.\n\n"
-        
-        if total_holidays > 0:
-            narrative += f"• **Impacto de feriados**: Se identificaron **{total_holidays} feriados** que influyen en los patrones de viaje, mostrando la importancia de los eventos culturales y nacionales en el tráfico aéreo.\n\n"
-        
-        if total_passengers > 0 and countries_analyzed > 0:
-            avg_per_country = total_passengers / countries_analyzed
-            narrative += f"• **Distribución promedio**: Cada país registra un promedio de **{avg_per_country:,.0f} pasajeros**, indicando la diversidad en la actividad aérea entre regiones.\n\n"
+        sections = {
+            "total_passengers": total_passengers,
+            "coverage": _GENERAL_COVERAGE_TMPL.format(countries_analyzed) if countries_analyzed > 0 else "",
+            "holidays": _GENERAL_HOLIDAYS_TMPL.format(total_holidays) if total_holidays > 0 else "",
+            "average": (
+                _GENERAL_AVERAGE_TMPL.format(total_passengers / countries_analyzed)
+                if total_passengers > 0 and countries_analyzed > 0 else ""
+            ),
+        }
+        parts = [_GENERAL_NARRATIVE_TMPL.format_map(sections)]
         
         # Additional insights
         if insights:
-            narrative += "**Hallazgos clave:**\n\n"
-            for insight in insights:
-                if "**" not in insight:  # Skip formatted insights
-                    narrative += f"• {insight}\n"
+            parts.append("**Hallazgos clave:**\n\n")
+            parts.extend(f"• {insight}\n" for insight in insights if "**" not in insight)  # Skip formatted insights
         
-        return narrative
+        return "".join(parts)
     
     def _create_trend_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for trend analysis."""
-        narrative = "## 📈 Análisis de Tendencias\n\n"
-        narrative += "**Evolución del tráfico aéreo:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 📈 Análisis de Tendencias\n\n", "**Evolución del tráfico aéreo:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_holiday_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for holiday impact analysis."""
-        narrative = "## 🎉 Impacto de Feriados en el Tráfico Aéreo\n\n"
-        narrative += "**Influencia de eventos especiales:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 🎉 Impacto de Feriados en el Tráfico Aéreo\n\n", "**Influencia de eventos especiales:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_geographic_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for geographic analysis."""
-        narrative = "## 🌍 Análisis Geográfico\n\n"
-        narrative += "**Distribución regional del tráfico:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 🌍 Análisis Geográfico\n\n", "**Distribución regional del tráfico:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_seasonal_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for seasonal analysis."""
-        narrative = "## 🗓️ Análisis Estacional\n\n"
-        narrative += "**Patrones temporales del tráfico:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 🗓️ Análisis Estacional\n\n", "**Patrones temporales del tráfico:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_statistical_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for statistical analysis."""
-        narrative = "## 📊 Análisis Estadístico\n\n"
-        narrative += "**Métricas y correlaciones:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 📊 Análisis Estadístico\n\n", "**Métricas y correlaciones:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_comparison_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a narrative summary for comparison analysis."""
-        narrative = "## ⚖️ Análisis Comparativo\n\n"
-        narrative += "**Comparación entre entidades:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## ⚖️ Análisis Comparativo\n\n", "**Comparación entre entidades:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
     
     def _create_default_narrative(self, insights: List[str], metrics: Dict[str, Any]) -> str:
         """Create a default narrative summary."""
-        narrative = "## 📋 Análisis de Datos\n\n"
-        narrative += "**Resultados del análisis:**\n\n"
-        
-        if insights:
-            for insight in insights:
-                narrative += f"• {insight}\n"
-        
-        return narrative
+        parts = ["## 📋 Análisis de Datos\n\n", "**Resultados del análisis:**\n\n"]
+        parts.extend(f"• {insight}\n" for insight in insights)
+        return "".join(parts)
 
 
 # Create a global instance for easy access
@@ -20,12 +20,14 @@ various data analysis tasks on the DataRush dataset.
 
 import os
 import sys
+import weakref
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
 # Add the parent directory to the path for importing components
@@ -45,15 +47,125 @@ except ImportError:
             self.name = name
             self.description = description
             self.func = func
+
+# Prefer orjson for figure serialization; fall back to the stdlib encoder
+try:
+    import orjson  # noqa: F401
+    JSON_ENGINE = "orjson"
+except ImportError:
+    JSON_ENGINE = "json"
+
 from components.data_loader import DataLoader
 from components.filters import Filters
 from components.visualizations import Visualizations
 
 
+# Stateless for apply_filters, so one instance is shared by every tool call
+_FILTERS = Filters()
+
+# Spanish month names indexed by month number (index 0 unused)
+_MONTH_NAMES_ES = (
+    '', 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio', 'Julio',
+    'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+)
+
+
+def _passenger_totals(passengers_df: pd.DataFrame) -> pd.Series:
+    """Passenger Total column widened to float64 for accumulation.
+    
+    Total is stored as float32 to save memory; aggregations are taken in
+    float64 so reported totals don't drift and results stay JSON-friendly.
+    """
+    return passengers_df['Total'].astype('float64')
+
+
+def _sum_by_year_month(passengers_df: pd.DataFrame) -> pd.Series:
+    """Sum passengers per (Year, Month) with one bincount over month slots.
+    
+    Equivalent to ``groupby(['Year', 'Month'])['Total'].sum()``: only the
+    periods present in the data are returned, sorted by Year then Month.
+    
+    Args:
+        passengers_df: Passenger data with Year, Month and Total columns
+        
+    Returns:
+        pd.Series: Totals indexed by (Year, Month)
+    """
+    if passengers_df.empty:
+        return _passenger_totals(passengers_df).groupby([passengers_df['Year'], passengers_df['Month']]).sum()
+    
+    years = passengers_df['Year'].to_numpy()
+    months = passengers_df['Month'].to_numpy()
+    totals = passengers_df['Total'].to_numpy(dtype=np.float64)
+    first_year = int(years.min())
+    
+    # One slot per calendar month from the first year on
+    slots = (years.astype(np.int64) - first_year) * 12 + (months.astype(np.int64) - 1)
+    sums = np.bincount(slots, weights=totals)
+    present = np.flatnonzero(np.bincount(slots))
+    
+    index = pd.MultiIndex.from_arrays(
+        [(present // 12 + first_year).astype(years.dtype), (present % 12 + 1).astype(months.dtype)],
+        names=['Year', 'Month']
+    )
+    return pd.Series(sums[present], index=index, name='Total')
+
+
+# Passenger aggregations shared by the analysis tools, keyed by name
+_AGGREGATIONS = {
+    'by_year_month': _sum_by_year_month,
+    'by_month': lambda df: _passenger_totals(df).groupby(df['Month']).agg(['sum', 'mean', 'std']),
+    'by_iso3': lambda df: _passenger_totals(df).groupby(df['ISO3']).agg(['sum', 'mean', 'count']),
+}
+
+# Aggregations rolled up from another cached aggregation instead of the raw rows
+_DERIVED_AGGREGATIONS = {
+    'by_year': ('by_year_month', lambda monthly: monthly.groupby(level='Year').sum()),
+}
+
+
+# (id(passengers_df), filters) -> (weak reference to the frame, {aggregation name: result})
+_aggregate_cache: Dict[Tuple[int, str], Tuple[weakref.ref, Dict[str, Any]]] = {}
+
+
+def _get_aggregate(passengers_df: pd.DataFrame, filters: Optional[Dict[str, Any]], name: str) -> Any:
+    """Get a passenger aggregation, computing it at most once per frame and filter set.
+    
+    Results are cached against the unfiltered frame, so repeated tool calls skip
+    both the filtering and the groupby. Entries are dropped when the frame is
+    garbage collected. Callers must not modify the returned object in place.
+    
+    Args:
+        passengers_df: Unfiltered passenger data
+        filters: Optional filters to apply before aggregating
+        name: Aggregation name (a key of _AGGREGATIONS or _DERIVED_AGGREGATIONS)
+        
+    Returns:
+        The aggregated Series or DataFrame
+    """
+    key = (id(passengers_df), repr(filters))
+    entry = _aggregate_cache.get(key)
+    if entry is None or entry[0]() is not passengers_df:
+        ref = weakref.ref(passengers_df, lambda _, key=key: _aggregate_cache.pop(key, None))
+        entry = _aggregate_cache[key] = (ref, {})
+    
+    aggregates = entry[1]
+    if name in _DERIVED_AGGREGATIONS and name not in aggregates:
+        base_name, roll_up = _DERIVED_AGGREGATIONS[name]
+        aggregates[name] = roll_up(_get_aggregate(passengers_df, filters, base_name))
+    if name not in aggregates:
+        source_df = passengers_df
+        if filters:
+            source_df = _FILTERS.apply_filters({'passengers': passengers_df}, filters)['passengers']
+        aggregates[name] = _AGGREGATIONS[name](source_df)
+    return aggregates[name]
+
+
 def analyze_trends(
     data: Dict[str, Any],
     filters: Dict[str, Any] = None,
-    time_period: str = "monthly"
+    time_period: str = "monthly",
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Analyze trends in passenger data over time.
     
@@ -61,6 +173,7 @@ def analyze_trends(
         data: Dictionary containing the loaded data
         filters: Optional filters to apply
         time_period: Time period for analysis (monthly, yearly, etc.)
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing trend analysis results
@@ -70,44 +183,41 @@ def analyze_trends(
         if passengers_df is None or passengers_df.empty:
             return {"error": "No passenger data available"}
         
-        # Apply filters if provided
-        if filters:
-            filter_obj = Filters()
-            passengers_df = filter_obj.apply_filters({'passengers': passengers_df}, filters)['passengers']
-        
-        # Group by time period
-        if time_period == "monthly":
-            grouped = passengers_df.groupby(['Year', 'Month'])['Total'].sum().reset_index()
-            grouped['Date'] = pd.to_datetime(grouped[['Year', 'Month']].assign(day=1))
-        elif time_period == "yearly":
-            grouped = passengers_df.groupby('Year')['Total'].sum().reset_index()
+        # Group by time period (filters are applied by the aggregate cache)
+        if time_period == "yearly":
+            grouped = _get_aggregate(passengers_df, filters, 'by_year').reset_index()
             grouped['Date'] = pd.to_datetime(grouped['Year'], format='%Y')
         else:
-            grouped = passengers_df.groupby(['Year', 'Month'])['Total'].sum().reset_index()
-            grouped['Date'] = pd.to_datetime(grouped[['Year', 'Month']].assign(day=1))
+            grouped = _get_aggregate(passengers_df, filters, 'by_year_month').reset_index()
+            # Parse YYYYMM integers directly (Year may be int16, so widen before scaling)
+            grouped['Date'] = pd.to_datetime(grouped['Year'].astype('int32') * 100 + grouped['Month'], format='%Y%m')
         
         # Calculate trend metrics
         total_passengers = grouped['Total'].sum()
         avg_period = grouped['Total'].mean()
         growth_rate = _calculate_growth_rate(grouped)
-        peak_period = grouped.loc[grouped['Total'].idxmax()]
-        low_period = grouped.loc[grouped['Total'].idxmin()]
-        
-        # Create visualization
-        fig = px.line(grouped, x='Date', y='Total', 
-                     title=f'Tendencias de Pasajeros - {time_period.title()}',
-                     labels={'Total': 'Total Pasajeros', 'Date': 'Fecha'})
-        fig.update_layout(xaxis_title='Fecha', yaxis_title='Total Pasajeros')
+        # Positional lookups from one array (grouped sums contain no missing values)
+        totals = grouped['Total'].to_numpy()
+        peak_period = grouped.iloc[int(totals.argmax())]
+        low_period = grouped.iloc[int(totals.argmin())]
+        
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = px.line(grouped, x='Date', y='Total', 
+                         title=f'Tendencias de Pasajeros - {time_period.title()}',
+                         labels={'Total': 'Total Pasajeros', 'Date': 'Fecha'})
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "trend_analysis",
             "time_period": time_period,
-            "total_passengers": total_passengers,
-            "avg_per_period": avg_period,
+            "total_passengers": float(total_passengers),
+            "avg_per_period": float(avg_period),
             "growth_rate": growth_rate,
             "peak_period": peak_period.to_dict(),
             "low_period": low_period.to_dict(),
-            "visualization": fig.to_json(),
+            "visualization": visualization,
             "data_points": len(grouped)
         }
         
@@ -117,13 +227,15 @@ def analyze_trends(
 
 def analyze_holiday_impact(
     data: Dict[str, Any],
-    filters: Dict[str, Any] = None
+    filters: Dict[str, Any] = None,
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Analyze the impact of holidays on passenger traffic.
     
     Args:
         data: Dictionary containing the loaded data
         filters: Optional filters to apply
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing holiday impact analysis results
@@ -138,57 +250,63 @@ def analyze_holiday_impact(
         if holidays_df is None or holidays_df.empty:
             return {"error": "No holiday data available"}
         
-        # Apply filters if provided
+        # Apply filters if provided (passenger filters are applied by the aggregate cache)
         if filters:
-            filter_obj = Filters()
-            filtered_data = filter_obj.apply_filters(data, filters)
-            passengers_df = filtered_data.get('passengers')
-            holidays_df = filtered_data.get('holidays')
+            holidays_df = _FILTERS.apply_filters({'holidays': holidays_df}, filters)['holidays']
         
-        # Process holiday data
-        holidays_df['Date'] = pd.to_datetime(holidays_df['Date'])
-        holidays_df['Month'] = holidays_df['Date'].dt.month
-        holidays_df['Year'] = holidays_df['Date'].dt.year
+        # Process holiday data (the DataLoader already provides parsed dates with Year/Month)
+        if not pd.api.types.is_datetime64_any_dtype(holidays_df['Date']):
+            holidays_df['Date'] = pd.to_datetime(holidays_df['Date'])
+        if 'Year' not in holidays_df.columns or 'Month' not in holidays_df.columns:
+            holidays_df['Month'] = holidays_df['Date'].dt.month
+            holidays_df['Year'] = holidays_df['Date'].dt.year
         
         # Group holidays by month and year
-        holiday_counts = holidays_df.groupby(['Year', 'Month']).size().reset_index(name='HolidayCount')
+        holiday_counts = holidays_df.groupby(['Year', 'Month']).size()
         
         # Group passengers by month and year
-        passenger_monthly = passengers_df.groupby(['Year', 'Month'])['Total'].sum().reset_index()
-        
-        # Merge data
-        combined_data = pd.merge(passenger_monthly, holiday_counts, on=['Year', 'Month'], how='left')
-        combined_data['HolidayCount'] = combined_data['HolidayCount'].fillna(0)
-        
-        # Calculate correlation
-        correlation = combined_data['Total'].corr(combined_data['HolidayCount'])
+        passenger_monthly = _get_aggregate(passengers_df, filters, 'by_year_month')
         
-        # Create visualization
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        # Align holiday counts on the passenger (Year, Month) index; months without holidays count 0
+        combined_data = passenger_monthly.to_frame().assign(
+            HolidayCount=holiday_counts.reindex(passenger_monthly.index, fill_value=0)
+        ).reset_index()
         
-        fig.add_trace(
-            go.Scatter(x=combined_data['Month'], y=combined_data['Total'], 
-                      name='Pasajeros', line=dict(color='blue')),
-            secondary_y=False,
+        # Calculate correlation on the aligned arrays (no missing values after the reindex)
+        correlation = _pearson(
+            combined_data['Total'].to_numpy(dtype=np.float64),
+            combined_data['HolidayCount'].to_numpy(dtype=np.float64)
         )
         
-        fig.add_trace(
-            go.Scatter(x=combined_data['Month'], y=combined_data['HolidayCount'], 
-                      name='Feriados', line=dict(color='red')),
-            secondary_y=True,
-        )
-        
-        fig.update_xaxes(title_text="Mes")
-        fig.update_yaxes(title_text="Total Pasajeros", secondary_y=False)
-        fig.update_yaxes(title_text="Número de Feriados", secondary_y=True)
-        fig.update_layout(title_text="Impacto de Feriados en Pasajeros")
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = make_subplots(specs=[[{"secondary_y": True}]])
+            
+            fig.add_trace(
+                go.Scatter(x=combined_data['Month'], y=combined_data['Total'], 
+                          name='Pasajeros', line=dict(color='blue')),
+                secondary_y=False,
+            )
+            
+            fig.add_trace(
+                go.Scatter(x=combined_data['Month'], y=combined_data['HolidayCount'], 
+                          name='Feriados', line=dict(color='red')),
+                secondary_y=True,
+            )
+            
+            fig.update_xaxes(title_text="Mes")
+            fig.update_yaxes(title_text="Total Pasajeros", secondary_y=False)
+            fig.update_yaxes(title_text="Número de Feriados", secondary_y=True)
+            fig.update_layout(title_text="Impacto de Feriados en Pasajeros")
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "holiday_impact_analysis",
             "correlation": correlation,
             "total_holidays": len(holidays_df),
             "countries_with_holidays": holidays_df['ISO3'].nunique(),
-            "visualization": fig.to_json(),
+            "visualization": visualization,
             "data_points": len(combined_data)
         }
         
@@ -199,7 +317,8 @@ def analyze_holiday_impact(
 def analyze_geographic_distribution(
     data: Dict[str, Any],
     filters: Dict[str, Any] = None,
-    top_n: int = 20
+    top_n: int = 20,
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Analyze geographic distribution of passenger data.
     
@@ -207,6 +326,7 @@ def analyze_geographic_distribution(
         data: Dictionary containing the loaded data
         filters: Optional filters to apply
         top_n: Number of top countries to include
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing geographic analysis results
@@ -216,33 +336,29 @@ def analyze_geographic_distribution(
         if passengers_df is None or passengers_df.empty:
             return {"error": "No passenger data available"}
         
-        # Apply filters if provided
-        if filters:
-            filter_obj = Filters()
-            filtered_data = filter_obj.apply_filters(data, filters)
-            passengers_df = filtered_data.get('passengers')
+        # Analyze by country (filters are applied by the aggregate cache)
+        country_analysis = _get_aggregate(passengers_df, filters, 'by_iso3')
         
-        # Analyze by country
-        country_analysis = passengers_df.groupby('ISO3')['Total'].agg(['sum', 'mean', 'count']).reset_index()
-        country_analysis = country_analysis.sort_values('sum', ascending=False)
+        # Get top countries (heap selection instead of sorting every country)
+        top_countries = country_analysis.nlargest(top_n, 'sum').reset_index()
         
-        # Get top countries
-        top_countries = country_analysis.head(top_n)
-        
-        # Create visualization
-        fig = px.treemap(top_countries, 
-                        path=['ISO3'], 
-                        values='sum',
-                        title=f'Distribución Geográfica de Pasajeros (Top {top_n})',
-                        labels={'sum': 'Total Pasajeros'})
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = px.treemap(top_countries, 
+                            path=['ISO3'], 
+                            values='sum',
+                            title=f'Distribución Geográfica de Pasajeros (Top {top_n})',
+                            labels={'sum': 'Total Pasajeros'})
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "geographic_analysis",
             "total_countries": len(country_analysis),
             "top_countries": top_countries.to_dict('records'),
-            "total_passengers": country_analysis['sum'].sum(),
-            "avg_per_country": country_analysis['sum'].mean(),
-            "visualization": fig.to_json(),
+            "total_passengers": float(country_analysis['sum'].sum()),
+            "avg_per_country": float(country_analysis['sum'].mean()),
+            "visualization": visualization,
             "data_points": len(country_analysis)
         }
         
@@ -252,13 +368,15 @@ def analyze_geographic_distribution(
 
 def analyze_seasonal_patterns(
     data: Dict[str, Any],
-    filters: Dict[str, Any] = None
+    filters: Dict[str, Any] = None,
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Analyze seasonal patterns in passenger data.
     
     Args:
         data: Dictionary containing the loaded data
         filters: Optional filters to apply
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing seasonal analysis results
@@ -268,34 +386,33 @@ def analyze_seasonal_patterns(
         if passengers_df is None or passengers_df.empty:
             return {"error": "No passenger data available"}
         
-        # Apply filters if provided
-        if filters:
-            filter_obj = Filters()
-            filtered_data = filter_obj.apply_filters(data, filters)
-            passengers_df = filtered_data.get('passengers')
-        
-        # Group by month for seasonal analysis
-        seasonal_data = passengers_df.groupby('Month')['Total'].agg(['sum', 'mean', 'std']).reset_index()
-        seasonal_data['MonthName'] = seasonal_data['Month'].apply(_get_month_name)
+        # Group by month for seasonal analysis (filters are applied by the aggregate cache)
+        seasonal_data = _get_aggregate(passengers_df, filters, 'by_month').reset_index()
+        seasonal_data['MonthName'] = pd.Categorical.from_codes(seasonal_data['Month'] - 1, categories=_MONTH_NAMES_ES[1:])
         
         # Calculate seasonal metrics
-        peak_month = seasonal_data.loc[seasonal_data['sum'].idxmax()]
-        low_month = seasonal_data.loc[seasonal_data['sum'].idxmin()]
-        seasonal_variation = (seasonal_data['sum'].max() - seasonal_data['sum'].min()) / seasonal_data['sum'].mean()
-        
-        # Create visualization
-        fig = px.bar(seasonal_data, x='MonthName', y='sum', 
-                    title='Análisis Estacional de Pasajeros',
-                    labels={'sum': 'Total Pasajeros', 'MonthName': 'Mes'})
-        fig.update_layout(xaxis_title='Mes', yaxis_title='Total Pasajeros')
+        monthly_sums = seasonal_data['sum'].to_numpy()
+        peak_idx = int(monthly_sums.argmax())
+        low_idx = int(monthly_sums.argmin())
+        peak_month = seasonal_data.iloc[peak_idx]
+        low_month = seasonal_data.iloc[low_idx]
+        seasonal_variation = (monthly_sums[peak_idx] - monthly_sums[low_idx]) / monthly_sums.mean()
+        
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = px.bar(seasonal_data, x='MonthName', y='sum', 
+                        title='Análisis Estacional de Pasajeros',
+                        labels={'sum': 'Total Pasajeros', 'MonthName': 'Mes'})
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "seasonal_analysis",
             "peak_month": peak_month.to_dict(),
             "low_month": low_month.to_dict(),
-            "seasonal_variation": seasonal_variation,
+            "seasonal_variation": float(seasonal_variation),
             "monthly_stats": seasonal_data.to_dict('records'),
-            "visualization": fig.to_json(),
+            "visualization": visualization,
             "data_points": len(seasonal_data)
         }
         
@@ -305,13 +422,15 @@ def analyze_seasonal_patterns(
 
 def perform_statistical_analysis(
     data: Dict[str, Any],
-    filters: Dict[str, Any] = None
+    filters: Dict[str, Any] = None,
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Perform statistical analysis on passenger data.
     
     Args:
         data: Dictionary containing the loaded data
         filters: Optional filters to apply
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing statistical analysis results
@@ -321,35 +440,33 @@ def perform_statistical_analysis(
         if passengers_df is None or passengers_df.empty:
             return {"error": "No passenger data available"}
         
-        # Apply filters if provided
+        # Apply filters if provided (only the passenger frame is needed here)
         if filters:
-            filter_obj = Filters()
-            filtered_data = filter_obj.apply_filters(data, filters)
-            passengers_df = filtered_data.get('passengers')
-        
-        # Calculate descriptive statistics
-        stats = passengers_df['Total'].describe()
-        
-        # Calculate additional metrics
-        median = passengers_df['Total'].median()
-        mode = passengers_df['Total'].mode().iloc[0] if not passengers_df['Total'].mode().empty else 0
-        skewness = passengers_df['Total'].skew()
-        kurtosis = passengers_df['Total'].kurtosis()
-        
-        # Create histogram
-        fig = px.histogram(passengers_df, x='Total', 
-                         title='Distribución de Pasajeros',
-                         labels={'Total': 'Total Pasajeros', 'count': 'Frecuencia'})
-        fig.update_layout(xaxis_title='Total Pasajeros', yaxis_title='Frecuencia')
+            passengers_df = _FILTERS.apply_filters({'passengers': passengers_df}, filters)['passengers']
+        
+        # Calculate descriptive statistics and additional metrics from one array
+        stats, skewness, kurtosis = _describe_values(passengers_df['Total'].dropna().to_numpy(dtype=np.float64))
+        median = stats['50%']
+        mode = _mode_value(passengers_df['Total'])
+        
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = px.histogram(passengers_df, x='Total', 
+                             title='Distribución de Pasajeros',
+                             labels={'Total': 'Total Pasajeros', 'count': 'Frecuencia'})
+            # px labels do not reach the histogram's aggregate y-axis title
+            fig.update_layout(yaxis_title='Frecuencia')
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "statistical_analysis",
-            "descriptive_stats": stats.to_dict(),
+            "descriptive_stats": stats,
             "median": median,
             "mode": mode,
             "skewness": skewness,
             "kurtosis": kurtosis,
-            "visualization": fig.to_json(),
+            "visualization": visualization,
             "data_points": len(passengers_df)
         }
         
@@ -361,7 +478,8 @@ def compare_countries(
     data: Dict[str, Any],
     filters: Dict[str, Any] = None,
     countries: List[str] = None,
-    top_n: int = 10
+    top_n: int = 10,
+    include_visualization: bool = True
 ) -> Dict[str, Any]:
     """Compare passenger data across countries.
     
@@ -370,6 +488,7 @@ def compare_countries(
         filters: Optional filters to apply
         countries: Specific countries to compare (if None, uses top N)
         top_n: Number of top countries to include if countries not specified
+        include_visualization: Whether to build and serialize the Plotly figure
         
     Returns:
         Dictionary containing country comparison results
@@ -379,36 +498,31 @@ def compare_countries(
         if passengers_df is None or passengers_df.empty:
             return {"error": "No passenger data available"}
         
-        # Apply filters if provided
-        if filters:
-            filter_obj = Filters()
-            filtered_data = filter_obj.apply_filters(data, filters)
-            passengers_df = filtered_data.get('passengers')
+        # Analyze by country (filters are applied by the aggregate cache)
+        country_analysis = _get_aggregate(passengers_df, filters, 'by_iso3')
         
-        # Filter by specific countries if provided
+        # Restrict to specific countries if provided; per-country rows are independent
         if countries:
-            passengers_df = passengers_df[passengers_df['ISO3'].isin(countries)]
+            country_analysis = country_analysis[country_analysis.index.isin(countries)]
         
-        # Analyze by country
-        country_analysis = passengers_df.groupby('ISO3')['Total'].agg(['sum', 'mean', 'count']).reset_index()
-        country_analysis = country_analysis.sort_values('sum', ascending=False)
+        # Get top countries (heap selection instead of sorting every country)
+        top_countries = country_analysis.nlargest(top_n, 'sum').reset_index()
         
-        # Get top countries
-        top_countries = country_analysis.head(top_n)
-        
-        # Create visualization
-        fig = px.bar(top_countries, x='ISO3', y='sum', 
-                    title=f'Comparación de Pasajeros por País (Top {top_n})',
-                    labels={'sum': 'Total Pasajeros', 'ISO3': 'País'})
-        fig.update_layout(xaxis_title='País', yaxis_title='Total Pasajeros')
+        # Create visualization only when requested
+        visualization = None
+        if include_visualization:
+            fig = px.bar(top_countries, x='ISO3', y='sum', 
+                        title=f'Comparación de Pasajeros por País (Top {top_n})',
+                        labels={'sum': 'Total Pasajeros', 'ISO3': 'País'})
+            visualization = _fig_to_json(fig)
         
         return {
             "analysis_type": "comparison_analysis",
             "total_countries": len(country_analysis),
             "top_countries": top_countries.to_dict('records'),
-            "total_passengers": country_analysis['sum'].sum(),
-            "avg_per_country": country_analysis['sum'].mean(),
-            "visualization": fig.to_json(),
+            "total_passengers": float(country_analysis['sum'].sum()),
+            "avg_per_country": float(country_analysis['sum'].mean()),
+            "visualization": visualization,
             "data_points": len(country_analysis)
         }
         
@@ -416,6 +530,108 @@ def compare_countries(
         return {"error": f"Error in country comparison: {str(e)}"}
 
 
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """Pearson correlation of two aligned arrays, 0.0 when it is undefined.
+    
+    Args:
+        x: First array
+        y: Second array of the same length
+        
+    Returns:
+        float: Correlation coefficient, or 0.0 for fewer than two points or a constant array
+    """
+    if x.size < 2 or x.min() == x.max() or y.min() == y.max():
+        return 0.0
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+def _describe_values(values: np.ndarray) -> Tuple[Dict[str, float], float, float]:
+    """Compute describe()-style statistics, skewness and kurtosis in NumPy.
+    
+    Central moments are taken from a single array of deviations and the
+    quartiles from one quantile call, matching pandas' sample (bias-corrected)
+    definitions of std, skew and kurtosis.
+    
+    Args:
+        values: 1-D float array without missing values
+        
+    Returns:
+        Tuple of (descriptive stats dict, skewness, kurtosis)
+    """
+    n = values.size
+    if n == 0:
+        stats = dict.fromkeys(('mean', 'std', 'min', '25%', '50%', '75%', 'max'), np.nan)
+        return {'count': 0.0, **stats}, np.nan, np.nan
+    
+    mean = values.mean()
+    deviations = values - mean
+    squared = deviations * deviations
+    m2 = squared.sum()
+    m3 = (squared * deviations).sum()
+    m4 = (squared * squared).sum()
+    q25, q50, q75 = np.quantile(values, (0.25, 0.5, 0.75))
+    
+    stats = {
+        'count': float(n),
+        'mean': float(mean),
+        'std': float(np.sqrt(m2 / (n - 1))) if n > 1 else np.nan,
+        'min': float(values.min()),
+        '25%': float(q25),
+        '50%': float(q50),
+        '75%': float(q75),
+        'max': float(values.max()),
+    }
+    
+    if n < 3:
+        skewness = np.nan
+    elif m2 == 0:
+        skewness = 0.0
+    else:
+        skewness = float(np.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5)
+    
+    if n < 4:
+        kurtosis = np.nan
+    elif m2 == 0:
+        kurtosis = 0.0
+    else:
+        kurtosis = float(
+            n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 * m2)
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        )
+    
+    return stats, skewness, kurtosis
+
+
+def _mode_value(series: pd.Series) -> float:
+    """Get the smallest most frequent value of a series, or 0 when empty.
+    
+    Args:
+        series: Numeric series
+        
+    Returns:
+        float: Mode of the series
+    """
+    values, counts = np.unique(series.dropna().to_numpy(), return_counts=True)
+    if values.size == 0:
+        return 0
+    return float(values[counts.argmax()])
+
+
+def _fig_to_json(fig: go.Figure) -> str:
+    """Serialize a figure built by these tools to JSON.
+    
+    The figures are constructed through plotly's validated API, so validation
+    is skipped here and the fastest available JSON engine is used.
+    
+    Args:
+        fig: Plotly figure to serialize
+        
+    Returns:
+        str: JSON representation of the figure
+    """
+    return pio.to_json(fig, validate=False, engine=JSON_ENGINE)
+
+
 def _calculate_growth_rate(data: pd.DataFrame) -> float:
     """Calculate growth rate from time series data.
     
@@ -425,19 +641,14 @@ def _calculate_growth_rate(data: pd.DataFrame) -> float:
     Returns:
         float: Growth rate as a percentage
     """
-    try:
-        if len(data) < 2:
-            return 0.0
-        
-        first_value = data['Total'].iloc[0]
-        last_value = data['Total'].iloc[-1]
-        
-        if first_value == 0:
-            return 0.0
-        
-        return (last_value - first_value) / first_value
-    except:
+    if 'Total' not in data:
+        return 0.0
+    
+    values = data['Total'].to_numpy()
+    if values.size < 2 or values[0] == 0:
         return 0.0
+    
+    return float((values[-1] - values[0]) / values[0])
 
 
 def _get_month_name(month_num: int) -> str:
@@ -449,12 +660,9 @@ def _get_month_name(month_num: int) -> str:
     Returns:
         str: Month name in Spanish
     """
-    month_names = {
-        1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-        5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-        9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-    }
-    return month_names.get(month_num, f'Mes {month_num}')
+    if 1 <= month_num <= 12:
+        return _MONTH_NAMES_ES[month_num]
+    return f'Mes {month_num}'
 
 
 # Create tool instances
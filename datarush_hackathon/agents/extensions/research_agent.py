@@ -14,17 +14,220 @@ Capacidades:
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+import copy
 import json
-import pandas as pd
+import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 import time
 import re
+import threading
+import functools
 from datetime import datetime, timedelta
 import os
+from urllib.parse import quote, urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# Cargar variables de entorno
-load_dotenv()
+# Preferir orjson para decodificar respuestas y serializar claves de cache
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Pool de conexiones HTTP compartido entre búsquedas
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 20
+HTTP_RETRY = Retry(total=3, backoff_factor=0.3)
+
+# Límite de llamadas por host (llamadas, segundos) y separación mínima entre
+# llamadas consecutivas al mismo host
+HOST_RATE_LIMIT = (100, 60.0)
+HOST_MIN_INTERVAL = 0.1
+
+# Máximo de investigaciones guardadas en cache
+RESEARCH_CACHE_SIZE = 512
+
+# Términos reconocidos por _extract_keywords, en orden de salida
+_TEMPORAL_TERMS = ('estacional', 'temporada', 'mes', 'año', 'crecimiento', 'tendencia', 'evolución')
+_ANALYSIS_TERMS = ('patrón', 'análisis', 'comparación', 'predicción', 'pronóstico')
+_HOLIDAY_TERMS = ('feriado', 'vacaciones', 'impacto', 'público', 'religioso')
+_KEYWORD_TERMS = _TEMPORAL_TERMS + _ANALYSIS_TERMS + _HOLIDAY_TERMS
+
+# Términos de aviación en una sola pasada, aceptando variantes sin tilde
+# ('tráfico aéreo' queda cubierto por 'aéreo')
+_AVIATION_RE = re.compile(r'aviaci[óo]n|a[ée]reo|aerol[ií]neas|pasajeros')
+
+# Categorías del tema que disparan insights y recomendaciones, detectadas en
+# una sola pasada (también sin tildes)
+_TOPIC_CATEGORY_RE = re.compile(
+    r'(?P<pattern>patr[óo]n|tendencia)'
+    r'|(?P<holiday>feriado|vacaciones)'
+    r'|(?P<growth>crecimiento|evoluci[óo]n)'
+    r'|(?P<analysis>an[áa]lisis)'
+    r'|(?P<prediction>predicci[óo]n|pron[óo]stico)'
+    r'|(?P<comparison>comparaci[óo]n)'
+)
+
+# Plantillas por categoría, en el orden en que se emiten
+_INSIGHT_TABLE = (
+    ('pattern', {
+        'type': 'pattern_insight',
+        'description': 'Identificación de patrones en datos de tráfico aéreo',
+        'confidence': 0.8,
+        'source': 'research_analysis'
+    }),
+    ('holiday', {
+        'type': 'holiday_insight',
+        'description': 'Impacto de feriados en el comportamiento de viajes',
+        'confidence': 0.9,
+        'source': 'research_analysis'
+    }),
+    ('growth', {
+        'type': 'growth_insight',
+        'description': 'Tendencias de crecimiento en el sector aéreo',
+        'confidence': 0.7,
+        'source': 'research_analysis'
+    }),
+)
+
+_RECOMMENDATION_TABLE = (
+    ('analysis', {
+        'type': 'analysis_recommendation',
+        'description': 'Considerar aplicar filtros específicos para un análisis más detallado',
+        'priority': 'medium'
+    }),
+    ('prediction', {
+        'type': 'prediction_recommendation',
+        'description': 'Usar datos históricos para generar proyecciones futuras',
+        'priority': 'high'
+    }),
+    ('comparison', {
+        'type': 'comparison_recommendation',
+        'description': 'Comparar diferentes países o períodos para identificar diferencias',
+        'priority': 'medium'
+    }),
+)
+
+# Palabras que suman relevancia a un contenido
+_IMPORTANT_WORDS = ('aviación', 'aéreo', 'pasajeros', 'feriado', 'tráfico')
+
+# Palabras clave que activan cada insight de contexto
+_SEASONAL_KEYWORDS = frozenset({'estacional', 'temporada', 'mes', 'año'})
+_GROWTH_KEYWORDS = frozenset({'crecimiento', 'tendencia', 'evolución'})
+_HOLIDAY_IMPACT_KEYWORDS = frozenset({'feriado', 'vacaciones', 'impacto'})
+_HOLIDAY_TYPE_KEYWORDS = frozenset({'tipo', 'categoría', 'público', 'religioso'})
+_GEOGRAPHIC_KEYWORDS = frozenset({'país', 'región', 'geográfico'})
+
+# Máximo de resúmenes de Wikipedia guardados junto a su ETag
+WIKIPEDIA_VALIDATOR_CACHE_SIZE = 256
+
+# Búsquedas sin resultados (404 o lista vacía) se recuerdan durante
+# NEGATIVE_CACHE_TTL segundos para no repetir peticiones condenadas
+NEGATIVE_CACHE_TTL = 300
+NEGATIVE_CACHE_SIZE = 2048
+
+# Versión del formato de resultados; cambiarla invalida las claves de cache previas
+RESEARCH_CACHE_VERSION = 1
+
+@functools.lru_cache(maxsize=1024)
+def _word_forms(word: str) -> Tuple[str, ...]:
+    """
+    Formas singular y plural aproximadas de una palabra en español
+    
+    Args:
+        word: Palabra en minúsculas
+        
+    Returns:
+        Tuple[str, ...]: La palabra y sus variantes
+    """
+    forms = [word, word + 's', word + 'es']
+    if len(word) > 3 and word.endswith('es'):
+        forms.append(word[:-2])
+    if len(word) > 2 and word.endswith('s'):
+        forms.append(word[:-1])
+    return tuple(forms)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """
+    Cargar variables de entorno una sola vez, al crear el primer agente
+    
+    Returns:
+        bool: True una vez cargadas
+    """
+    load_dotenv()
+    return True
+
+
+def _record(log: Optional[List[Tuple[str, str]]], level: str, message: str) -> None:
+    """
+    Añadir un mensaje al registro de la llamada en curso, si lo hay
+    
+    Args:
+        log: Registro (nivel, mensaje) de la llamada, o None para descartarlo
+        level: Nivel de Streamlit ('info', 'warning', 'error')
+        message: Texto del mensaje
+    """
+    if log is not None:
+        log.append((level, message))
+
+
+@functools.lru_cache(maxsize=1024)
+def _topic_categories(topic: str) -> frozenset:
+    """
+    Categorías de insights/recomendaciones mencionadas en un tema
+    
+    Args:
+        topic: Tema investigado
+        
+    Returns:
+        frozenset: Nombres de categoría de _TOPIC_CATEGORY_RE presentes
+    """
+    return frozenset(match.lastgroup for match in _TOPIC_CATEGORY_RE.finditer(topic.lower()))
+
+
+class _HostRateLimiter:
+    """
+    Token bucket por host: reparte las llamadas a un mismo servidor para no
+    disparar sus límites de frecuencia (HTTP 429)
+    """
+    
+    def __init__(self, max_calls: int, period: float, min_interval: float):
+        self.capacity = float(max_calls)
+        self.refill_rate = max_calls / period
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._buckets = {}  # host -> (tokens, actualizado_en, última_llamada)
+    
+    def acquire(self, host: str) -> None:
+        """
+        Reservar un turno para llamar al host, esperando si es necesario
+        
+        Args:
+            host: Servidor de destino
+        """
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at, last_call = self._buckets.get(host, (self.capacity, now, float('-inf')))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+            
+            wait = max(0.0,
+                       (1.0 - tokens) / self.refill_rate,
+                       last_call + self.min_interval - now)
+            slot = now + wait
+            tokens = min(self.capacity, tokens + wait * self.refill_rate) - 1.0
+            self._buckets[host] = (tokens, slot, slot)
+        
+        # Dormir fuera del lock: otros hosts no esperan por este
+        if wait > 0:
+            time.sleep(wait)
+
 
 class ResearchAgent:
     """
@@ -32,6 +235,7 @@ class ResearchAgent:
     """
     
     def __init__(self):
+        _load_env()
         self.api_keys = {
             'google': os.getenv('GOOGLE_SEARCH_API_KEY'),
             'bing': os.getenv('BING_SEARCH_API_KEY'),
@@ -40,8 +244,24 @@ class ResearchAgent:
         }
         
         self.search_engines = ['wikipedia', 'google', 'bing', 'news']
-        self.research_cache = {}
+        self.research_cache = {}  # cache_key -> (expira_en, resultados)
         self.max_cache_age = 3600  # 1 hora en segundos
+        self._cache_lock = threading.Lock()
+        self._refreshing = set()  # claves con una actualización en segundo plano en curso
+        self._wikipedia_validators = {}  # url -> (ETag, resumen) para peticiones condicionales
+        self._negative_cache = {}  # (servicio, consulta) -> expira_en
+        
+        # Sesión HTTP reutilizable: mantiene vivas las conexiones TLS entre
+        # búsquedas en lugar de abrir una nueva por cada requests.get
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS,
+                              pool_maxsize=HTTP_POOL_MAXSIZE,
+                              max_retries=HTTP_RETRY)
+        self.http.mount('https://', adapter)
+        # Pedir respuestas comprimidas con todos los códecs que urllib3 sabe
+        # decodificar aquí (gzip/deflate y br si brotli está instalado)
+        self.http.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        self._rate_limiter = _HostRateLimiter(*HOST_RATE_LIMIT, HOST_MIN_INTERVAL)
         
     def research_topic(self, topic: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -52,15 +272,39 @@ class ResearchAgent:
             context: Contexto de los datos actuales
             
         Returns:
-            Dict: Resultados de la investigación
+            Dict: Resultados de la investigación; 'log' contiene los mensajes
+            (nivel, texto) de esta llamada para que el llamador los muestre
+            con render_log
         """
-        # Verificar cache primero
-        cache_key = f"{topic}_{hash(str(context))}"
-        if self._is_cached(cache_key):
-            return self.research_cache[cache_key]
-        
-        st.info(f"🔍 Investigando: {topic}")
+        # El agente se comparte entre sesiones: cada llamada lleva su propio
+        # registro en lugar de acumularlo en la instancia
+        log = []
+        
+        # Verificar cache primero; una entrada expirada se sirve igualmente
+        # mientras se actualiza en segundo plano
+        cache_key = self._cache_key(topic, context)
+        cached, expired = self._get_cached(cache_key)
+        if cached is not None:
+            if expired:
+                self._schedule_refresh(cache_key, topic, context)
+            return {**cached, 'log': log}
+        
+        _record(log, 'info', f"🔍 Investigando: {topic}")
+        return {**self._run_research(cache_key, topic, context, log), 'log': log}
+    
+    def _run_research(self, cache_key: str, topic: str, context: Dict[str, Any] = None, log: Optional[List[Tuple[str, str]]] = None) -> Dict[str, Any]:
+        """
+        Ejecutar la investigación completa y guardarla en cache
         
+        Args:
+            cache_key: Clave del cache
+            topic: Tema a investigar
+            context: Contexto de los datos actuales
+            log: Registro (nivel, mensaje) de la llamada en curso
+            
+        Returns:
+            Dict: Resultados de la investigación
+        """
         research_results = {
             'topic': topic,
             'timestamp': datetime.now().isoformat(),
@@ -71,64 +315,113 @@ class ResearchAgent:
         }
         
         try:
-            # 1. Búsqueda en Wikipedia para contexto general
-            wikipedia_info = self._search_wikipedia(topic)
+            # 1-3. Wikipedia, búsqueda web y noticias son independientes y
+            # dominadas por la red: se lanzan en paralelo para pagar el RTT
+            # más lento en lugar de la suma de los tres.
+            wikipedia_info, web_results, news_results = self._run_searches(topic, context, log)
+            
             if wikipedia_info:
                 research_results['sources'].append(wikipedia_info)
-            
-            # 2. Búsqueda web para información actual
-            web_results = self._search_web(topic, context)
             if web_results:
                 research_results['sources'].extend(web_results)
-            
-            # 3. Búsqueda de noticias para información reciente
-            news_results = self._search_news(topic)
             if news_results:
                 research_results['sources'].extend(news_results)
             
             # 4. Analizar contexto de datos si está disponible
             if context:
-                data_insights = self._analyze_data_context(topic, context)
+                data_insights = self._analyze_data_context(topic, context, log)
                 if data_insights:
                     research_results['insights'].extend(data_insights)
             
             # 5. Generar insights basados en la investigación
-            insights = self._generate_insights(topic, research_results['sources'])
+            insights = self._generate_insights(topic, research_results['sources'], log)
             research_results['insights'].extend(insights)
             
             # 6. Generar recomendaciones
-            recommendations = self._generate_recommendations(topic, research_results)
+            recommendations = self._generate_recommendations(topic, research_results, log)
             research_results['recommendations'].extend(recommendations)
             
             # 7. Calcular confianza en los resultados
             research_results['confidence'] = self._calculate_confidence(research_results)
             
             # Guardar en cache
-            self.research_cache[cache_key] = research_results
+            self._set_cached(cache_key, research_results)
             
             return research_results
             
         except Exception as e:
-            st.error(f"❌ Error en investigación: {str(e)}")
+            _record(log, 'error', f"❌ Error en investigación: {str(e)}")
             return research_results
     
-    def _search_wikipedia(self, topic: str) -> Optional[Dict[str, Any]]:
+    def _run_searches(self, topic: str, context: Dict[str, Any] = None, log: Optional[List[Tuple[str, str]]] = None) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Ejecutar las búsquedas externas de forma concurrente
+        
+        Args:
+            topic: Tema a buscar
+            context: Contexto de los datos
+            log: Registro (nivel, mensaje) de la llamada en curso
+            
+        Returns:
+            Tuple: (Wikipedia, resultados web, noticias)
+        """
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            wikipedia_future = executor.submit(self._search_wikipedia, topic, log)
+            web_future = executor.submit(self._search_web, topic, context, log)
+            news_future = executor.submit(self._search_news, topic, log)
+            return wikipedia_future.result(), web_future.result(), news_future.result()
+    
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET sobre la sesión compartida respetando el límite por host
+        
+        Args:
+            url: URL a consultar
+            **kwargs: Argumentos adicionales para requests
+            
+        Returns:
+            requests.Response: Respuesta del servidor
+        """
+        self._rate_limiter.acquire(urlsplit(url).netloc)
+        return self.http.get(url, **kwargs)
+    
+    def _search_wikipedia(self, topic: str, log: Optional[List[Tuple[str, str]]] = None) -> Optional[Dict[str, Any]]:
         """
         Buscar información en Wikipedia
         
         Args:
             topic: Tema a buscar
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             Dict: Información de Wikipedia
         """
+        if self._is_known_empty('wikipedia', topic):
+            return None
+        
         try:
-            # Buscar página de Wikipedia
-            search_url = "https://es.wikipedia.org/api/rest_v1/page/summary/" + topic.replace(" ", "_")
-            response = requests.get(search_url, timeout=10)
+            # Buscar página de Wikipedia; el título se codifica porque acentos,
+            # '?', '&', '/' o '+' producirían una URL inválida
+            search_url = "https://es.wikipedia.org/api/rest_v1/page/summary/" + quote(topic.replace(" ", "_"), safe='')
             
-            if response.status_code == 200:
-                data = response.json()
+            # Petición condicional: si el resumen no cambió, Wikipedia responde
+            # 304 sin cuerpo y se reutiliza la copia guardada
+            validator = self._wikipedia_validators.get(search_url)
+            headers = {'If-None-Match': validator[0]} if validator else None
+            response = self._http_get(search_url, headers=headers, timeout=10)
+            
+            data = None
+            if response.status_code == 304 and validator:
+                data = validator[1]
+            elif response.status_code == 200:
+                data = _json_loads(response.content)
+                etag = response.headers.get('ETag')
+                if etag:
+                    self._remember_wikipedia_validator(search_url, etag, data)
+            elif response.status_code == 404:
+                self._remember_empty('wikipedia', topic)
+            
+            if data is not None:
                 return {
                     'source': 'Wikipedia',
                     'title': data.get('title', ''),
@@ -137,17 +430,64 @@ class ResearchAgent:
                     'relevance_score': self._calculate_relevance_score(topic, data.get('extract', ''))
                 }
         except Exception as e:
-            st.warning(f"⚠️ Error buscando en Wikipedia: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error buscando en Wikipedia: {str(e)}")
         
         return None
     
-    def _search_web(self, topic: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+    def _remember_wikipedia_validator(self, url: str, etag: str, data: Dict[str, Any]) -> None:
+        """
+        Guardar el ETag y el resumen de una página de Wikipedia
+        
+        Args:
+            url: URL del resumen
+            etag: ETag devuelto por Wikipedia
+            data: Resumen decodificado
+        """
+        with self._cache_lock:
+            self._wikipedia_validators.pop(url, None)
+            if len(self._wikipedia_validators) >= WIKIPEDIA_VALIDATOR_CACHE_SIZE:
+                del self._wikipedia_validators[next(iter(self._wikipedia_validators))]
+            self._wikipedia_validators[url] = (etag, data)
+    
+    def _is_known_empty(self, service: str, query: str) -> bool:
+        """
+        Verificar si una búsqueda devolvió recientemente un resultado vacío
+        
+        Args:
+            service: Servicio consultado ('wikipedia', 'google', 'news')
+            query: Tema o consulta enviada
+            
+        Returns:
+            bool: True si la búsqueda se sabe vacía y no ha expirado
+        """
+        expires_at = self._negative_cache.get((service, query))
+        return expires_at is not None and time.monotonic() < expires_at
+    
+    def _remember_empty(self, service: str, query: str) -> None:
+        """
+        Recordar durante NEGATIVE_CACHE_TTL que una búsqueda no tuvo resultados
+        
+        Args:
+            service: Servicio consultado ('wikipedia', 'google', 'news')
+            query: Tema o consulta enviada
+        """
+        now = time.monotonic()
+        with self._cache_lock:
+            if len(self._negative_cache) >= NEGATIVE_CACHE_SIZE:
+                for key in [k for k, expires_at in self._negative_cache.items() if expires_at <= now]:
+                    del self._negative_cache[key]
+                if len(self._negative_cache) >= NEGATIVE_CACHE_SIZE:
+                    del self._negative_cache[next(iter(self._negative_cache))]
+            self._negative_cache[(service, query)] = now + NEGATIVE_CACHE_TTL
+    
+    def _search_web(self, topic: str, context: Dict[str, Any] = None, log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Buscar información en la web usando Google Custom Search
         
         Args:
             topic: Tema a buscar
             context: Contexto de los datos
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Resultados de búsqueda web
@@ -155,12 +495,14 @@ class ResearchAgent:
         results = []
         
         if not self.api_keys['google']:
-            st.warning("⚠️ Google Search API key no configurada")
+            _record(log, 'warning', "⚠️ Google Search API key no configurada")
             return results
         
         try:
             # Construir query de búsqueda
             query = self._build_search_query(topic, context)
+            if self._is_known_empty('google', query):
+                return results
             
             # Buscar en Google
             search_url = "https://www.googleapis.com/customsearch/v1"
@@ -169,13 +511,17 @@ class ResearchAgent:
                 'cx': os.getenv('GOOGLE_SEARCH_ENGINE_ID', ''),
                 'q': query,
                 'num': 5,
-                'lr': 'lang_es'  # Búsqueda en español
+                'lr': 'lang_es',  # Búsqueda en español
+                # Respuesta parcial: sólo los campos que se usan de cada resultado
+                'fields': 'items(title,snippet,link)'
             }
             
-            response = requests.get(search_url, params=params, timeout=10)
+            response = self._http_get(search_url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
+                if not data.get('items'):
+                    self._remember_empty('google', query)
                 for item in data.get('items', []):
                     results.append({
                         'source': 'Google Search',
@@ -186,23 +532,24 @@ class ResearchAgent:
                     })
         
         except Exception as e:
-            st.warning(f"⚠️ Error en búsqueda web: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error en búsqueda web: {str(e)}")
         
         return results
     
-    def _search_news(self, topic: str) -> List[Dict[str, Any]]:
+    def _search_news(self, topic: str, log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Buscar noticias recientes sobre el tema
         
         Args:
             topic: Tema a buscar
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Resultados de noticias
         """
         results = []
         
-        if not self.api_keys['news']:
+        if not self.api_keys['news'] or self._is_known_empty('news', topic):
             return results
         
         try:
@@ -219,10 +566,12 @@ class ResearchAgent:
                 'pageSize': 5
             }
             
-            response = requests.get(news_url, params=params, timeout=10)
+            response = self._http_get(news_url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
+                if not data.get('articles'):
+                    self._remember_empty('news', topic)
                 for article in data.get('articles', []):
                     results.append({
                         'source': 'News API',
@@ -234,17 +583,18 @@ class ResearchAgent:
                     })
         
         except Exception as e:
-            st.warning(f"⚠️ Error buscando noticias: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error buscando noticias: {str(e)}")
         
         return results
     
-    def _analyze_data_context(self, topic: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_data_context(self, topic: str, context: Dict[str, Any], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Analizar el contexto de los datos para generar insights
         
         Args:
             topic: Tema a analizar
             context: Contexto de los datos
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Insights basados en datos
@@ -252,33 +602,37 @@ class ResearchAgent:
         insights = []
         
         try:
+            # Palabras clave del tema, compartidas por los analizadores
+            topic_keywords = frozenset(self._extract_keywords(topic))
+            
             # Analizar datos de pasajeros
             if 'passengers' in context and context['passengers']:
-                passenger_insights = self._analyze_passenger_context(topic, context['passengers'])
+                passenger_insights = self._analyze_passenger_context(topic_keywords, context['passengers'], log)
                 insights.extend(passenger_insights)
             
             # Analizar datos de feriados
             if 'holidays' in context and context['holidays']:
-                holiday_insights = self._analyze_holiday_context(topic, context['holidays'])
+                holiday_insights = self._analyze_holiday_context(topic_keywords, context['holidays'], log)
                 insights.extend(holiday_insights)
             
             # Analizar filtros aplicados
             if 'filters' in context and context['filters']:
-                filter_insights = self._analyze_filter_context(topic, context['filters'])
+                filter_insights = self._analyze_filter_context(topic, context['filters'], log)
                 insights.extend(filter_insights)
         
         except Exception as e:
-            st.warning(f"⚠️ Error analizando contexto: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error analizando contexto: {str(e)}")
         
         return insights
     
-    def _analyze_passenger_context(self, topic: str, passenger_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_passenger_context(self, topic_keywords: frozenset, passenger_data: Dict[str, Any], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Analizar contexto de datos de pasajeros
         
         Args:
-            topic: Tema a analizar
+            topic_keywords: Palabras clave extraídas del tema
             passenger_data: Datos de pasajeros
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Insights de pasajeros
@@ -286,11 +640,8 @@ class ResearchAgent:
         insights = []
         
         try:
-            # Extraer palabras clave del tema
-            topic_keywords = self._extract_keywords(topic)
-            
             # Analizar patrones estacionales
-            if any(keyword in topic_keywords for keyword in ['estacional', 'temporada', 'mes', 'año']):
+            if topic_keywords & _SEASONAL_KEYWORDS:
                 insights.append({
                     'type': 'seasonal_analysis',
                     'description': 'Análisis de patrones estacionales en datos de pasajeros',
@@ -299,7 +650,7 @@ class ResearchAgent:
                 })
             
             # Analizar crecimiento
-            if any(keyword in topic_keywords for keyword in ['crecimiento', 'tendencia', 'evolución']):
+            if topic_keywords & _GROWTH_KEYWORDS:
                 insights.append({
                     'type': 'growth_analysis',
                     'description': 'Análisis de tendencias de crecimiento en tráfico aéreo',
@@ -308,7 +659,7 @@ class ResearchAgent:
                 })
             
             # Analizar impacto de feriados
-            if any(keyword in topic_keywords for keyword in ['feriado', 'vacaciones', 'impacto']):
+            if topic_keywords & _HOLIDAY_IMPACT_KEYWORDS:
                 insights.append({
                     'type': 'holiday_impact',
                     'description': 'Análisis del impacto de feriados en el tráfico aéreo',
@@ -317,17 +668,18 @@ class ResearchAgent:
                 })
         
         except Exception as e:
-            st.warning(f"⚠️ Error analizando contexto de pasajeros: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error analizando contexto de pasajeros: {str(e)}")
         
         return insights
     
-    def _analyze_holiday_context(self, topic: str, holiday_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_holiday_context(self, topic_keywords: frozenset, holiday_data: Dict[str, Any], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Analizar contexto de datos de feriados
         
         Args:
-            topic: Tema a analizar
+            topic_keywords: Palabras clave extraídas del tema
             holiday_data: Datos de feriados
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Insights de feriados
@@ -335,10 +687,8 @@ class ResearchAgent:
         insights = []
         
         try:
-            topic_keywords = self._extract_keywords(topic)
-            
             # Analizar tipos de feriados
-            if any(keyword in topic_keywords for keyword in ['tipo', 'categoría', 'público', 'religioso']):
+            if topic_keywords & _HOLIDAY_TYPE_KEYWORDS:
                 insights.append({
                     'type': 'holiday_type_analysis',
                     'description': 'Análisis de tipos y categorías de feriados',
@@ -347,7 +697,7 @@ class ResearchAgent:
                 })
             
             # Analizar distribución geográfica
-            if any(keyword in topic_keywords for keyword in ['país', 'región', 'geográfico']):
+            if topic_keywords & _GEOGRAPHIC_KEYWORDS:
                 insights.append({
                     'type': 'geographic_analysis',
                     'description': 'Análisis de distribución geográfica de feriados',
@@ -356,17 +706,18 @@ class ResearchAgent:
                 })
         
         except Exception as e:
-            st.warning(f"⚠️ Error analizando contexto de feriados: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error analizando contexto de feriados: {str(e)}")
         
         return insights
     
-    def _analyze_filter_context(self, topic: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _analyze_filter_context(self, topic: str, filters: Dict[str, Any], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Analizar contexto de filtros aplicados
         
         Args:
             topic: Tema a analizar
             filters: Filtros aplicados
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Insights de filtros
@@ -395,17 +746,18 @@ class ResearchAgent:
                 })
         
         except Exception as e:
-            st.warning(f"⚠️ Error analizando contexto de filtros: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error analizando contexto de filtros: {str(e)}")
         
         return insights
     
-    def _generate_insights(self, topic: str, sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _generate_insights(self, topic: str, sources: List[Dict[str, Any]], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Generar insights basados en la investigación
         
         Args:
             topic: Tema investigado
             sources: Fuentes de información
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Insights generados
@@ -413,48 +765,23 @@ class ResearchAgent:
         insights = []
         
         try:
-            # Combinar información de todas las fuentes
-            combined_text = ""
-            for source in sources:
-                combined_text += f"{source.get('title', '')} {source.get('snippet', '')} {source.get('extract', '')} "
-            
-            # Generar insights basados en el contenido
-            if 'patrón' in topic.lower() or 'tendencia' in topic.lower():
-                insights.append({
-                    'type': 'pattern_insight',
-                    'description': 'Identificación de patrones en datos de tráfico aéreo',
-                    'confidence': 0.8,
-                    'source': 'research_analysis'
-                })
-            
-            if 'feriado' in topic.lower() or 'vacaciones' in topic.lower():
-                insights.append({
-                    'type': 'holiday_insight',
-                    'description': 'Impacto de feriados en el comportamiento de viajes',
-                    'confidence': 0.9,
-                    'source': 'research_analysis'
-                })
-            
-            if 'crecimiento' in topic.lower() or 'evolución' in topic.lower():
-                insights.append({
-                    'type': 'growth_insight',
-                    'description': 'Tendencias de crecimiento en el sector aéreo',
-                    'confidence': 0.7,
-                    'source': 'research_analysis'
-                })
+            # Generar insights basados en el tema
+            categories = _topic_categories(topic)
+            insights.extend(dict(insight) for category, insight in _INSIGHT_TABLE if category in categories)
         
         except Exception as e:
-            st.warning(f"⚠️ Error generando insights: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error generando insights: {str(e)}")
         
         return insights
     
-    def _generate_recommendations(self, topic: str, research_results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_recommendations(self, topic: str, research_results: Dict[str, Any], log: Optional[List[Tuple[str, str]]] = None) -> List[Dict[str, Any]]:
         """
         Generar recomendaciones basadas en la investigación
         
         Args:
             topic: Tema investigado
             research_results: Resultados de la investigación
+            log: Registro (nivel, mensaje) de la llamada en curso
             
         Returns:
             List[Dict]: Recomendaciones generadas
@@ -463,26 +790,9 @@ class ResearchAgent:
         
         try:
             # Recomendaciones basadas en el tema
-            if 'análisis' in topic.lower():
-                recommendations.append({
-                    'type': 'analysis_recommendation',
-                    'description': 'Considerar aplicar filtros específicos para un análisis más detallado',
-                    'priority': 'medium'
-                })
-            
-            if 'predicción' in topic.lower() or 'pronóstico' in topic.lower():
-                recommendations.append({
-                    'type': 'prediction_recommendation',
-                    'description': 'Usar datos históricos para generar proyecciones futuras',
-                    'priority': 'high'
-                })
-            
-            if 'comparación' in topic.lower():
-                recommendations.append({
-                    'type': 'comparison_recommendation',
-                    'description': 'Comparar diferentes países o períodos para identificar diferencias',
-                    'priority': 'medium'
-                })
+            categories = _topic_categories(topic)
+            recommendations.extend(dict(recommendation) for category, recommendation in _RECOMMENDATION_TABLE
+                                   if category in categories)
             
             # Recomendaciones basadas en la confianza
             if research_results['confidence'] < 0.5:
@@ -493,7 +803,7 @@ class ResearchAgent:
                 })
         
         except Exception as e:
-            st.warning(f"⚠️ Error generando recomendaciones: {str(e)}")
+            _record(log, 'warning', f"⚠️ Error generando recomendaciones: {str(e)}")
         
         return recommendations
     
@@ -511,8 +821,7 @@ class ResearchAgent:
         query = topic
         
         # Agregar términos relacionados con aviación si no están presentes
-        aviation_terms = ['aviación', 'aéreo', 'aerolíneas', 'pasajeros', 'tráfico aéreo']
-        if not any(term in topic.lower() for term in aviation_terms):
+        if not _AVIATION_RE.search(topic.lower()):
             query += " aviación tráfico aéreo"
         
         # Agregar contexto temporal si está disponible
@@ -524,7 +833,9 @@ class ResearchAgent:
         
         return query
     
-    def _extract_keywords(self, text: str) -> List[str]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _extract_keywords(text: str) -> Tuple[str, ...]:
         """
         Extraer palabras clave de un texto
         
@@ -532,30 +843,13 @@ class ResearchAgent:
             text: Texto a procesar
             
         Returns:
-            List[str]: Palabras clave extraídas
+            Tuple[str, ...]: Palabras clave extraídas (inmutable: el resultado
+            se comparte entre llamadas a través del cache)
         """
-        # Palabras clave relevantes para el análisis de datos
-        keywords = []
-        
-        # Términos temporales
-        temporal_terms = ['estacional', 'temporada', 'mes', 'año', 'crecimiento', 'tendencia', 'evolución']
-        for term in temporal_terms:
-            if term in text.lower():
-                keywords.append(term)
-        
-        # Términos de análisis
-        analysis_terms = ['patrón', 'análisis', 'comparación', 'predicción', 'pronóstico']
-        for term in analysis_terms:
-            if term in text.lower():
-                keywords.append(term)
-        
-        # Términos de feriados
-        holiday_terms = ['feriado', 'vacaciones', 'impacto', 'público', 'religioso']
-        for term in holiday_terms:
-            if term in text.lower():
-                keywords.append(term)
-        
-        return keywords
+        # Substring sobre el texto en minúsculas una sola vez: así 'años' o
+        # 'tendencias' siguen activando 'año' y 'tendencia'
+        text_lower = text.lower()
+        return tuple(term for term in _KEYWORD_TERMS if term in text_lower)
     
     def _calculate_relevance_score(self, topic: str, content: str) -> float:
         """
@@ -572,21 +866,20 @@ class ResearchAgent:
             return 0.0
         
         topic_words = set(topic.lower().split())
-        content_words = set(content.lower().split())
-        
-        # Calcular intersección de palabras
-        common_words = topic_words.intersection(content_words)
-        
         if not topic_words:
             return 0.0
         
-        # Score basado en la proporción de palabras comunes
-        relevance_score = len(common_words) / len(topic_words)
+        content_lower = content.lower()
+        
+        # Score basado en la proporción de palabras del tema presentes en el
+        # contenido, aceptando su forma singular o plural ('vuelo'/'vuelos')
+        content_words = set(content_lower.split())
+        matched_words = sum(1 for word in topic_words if not content_words.isdisjoint(_word_forms(word)))
+        relevance_score = matched_words / len(topic_words)
         
         # Bonus por palabras clave importantes
-        important_words = ['aviación', 'aéreo', 'pasajeros', 'feriado', 'tráfico']
-        for word in important_words:
-            if word in content.lower():
+        for word in _IMPORTANT_WORDS:
+            if word in content_lower:
                 relevance_score += 0.1
         
         return min(relevance_score, 1.0)
@@ -603,15 +896,15 @@ class ResearchAgent:
         """
         confidence = 0.0
         
-        # Confianza basada en número de fuentes
-        source_count = len(research_results.get('sources', []))
+        sources = research_results.get('sources', [])
+        source_count = len(sources)
+        
         if source_count > 0:
+            # Confianza basada en número de fuentes
             confidence += min(source_count * 0.2, 0.6)
-        
-        # Confianza basada en relevancia de fuentes
-        sources = research_results.get('sources', [])
-        if sources:
-            avg_relevance = sum(source.get('relevance_score', 0) for source in sources) / len(sources)
+            
+            # Confianza basada en relevancia de fuentes
+            avg_relevance = sum(source.get('relevance_score', 0) for source in sources) / source_count
             confidence += avg_relevance * 0.3
         
         # Confianza basada en insights generados
@@ -621,24 +914,121 @@ class ResearchAgent:
         
         return min(confidence, 1.0)
     
-    def _is_cached(self, cache_key: str) -> bool:
+    def _cache_key(self, topic: str, context: Dict[str, Any] = None) -> str:
         """
-        Verificar si un resultado está en cache
+        Construir una clave de cache determinista para un tema y su contexto
+        
+        Args:
+            topic: Tema investigado
+            context: Contexto de los datos
+            
+        Returns:
+            str: Clave del cache
+        """
+        # JSON con claves ordenadas: contextos equivalentes producen la misma
+        # clave sin depender del orden del dict ni de PYTHONHASHSEED
+        key_data = [RESEARCH_CACHE_VERSION, topic, context]
+        try:
+            if orjson is not None:
+                payload = orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS, default=str)
+            else:
+                payload = json.dumps(key_data, sort_keys=True, default=str).encode('utf-8')
+        except TypeError:
+            # Claves de tipos mixtos o no textuales no se pueden ordenar
+            payload = json.dumps(key_data, default=str).encode('utf-8')
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _get_cached(self, cache_key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Obtener un resultado del cache
         
         Args:
             cache_key: Clave del cache
             
         Returns:
-            bool: True si está en cache y es válido
+            Tuple: (copia del resultado en cache o None, True si ya expiró)
         """
-        if cache_key not in self.research_cache:
-            return False
+        with self._cache_lock:
+            entry = self.research_cache.pop(cache_key, None)
+            if entry is None:
+                return None, False
+            
+            # Reinsertar al final para mantener orden LRU
+            self.research_cache[cache_key] = entry
         
-        cached_result = self.research_cache[cache_key]
-        timestamp = datetime.fromisoformat(cached_result['timestamp'])
+        # La entrada se comparte entre sesiones: cada llamador recibe su copia
+        expires_at, cached_result = entry
+        return copy.deepcopy(cached_result), time.monotonic() >= expires_at
+    
+    def _set_cached(self, cache_key: str, research_results: Dict[str, Any]) -> None:
+        """
+        Guardar un resultado en cache con su tiempo de expiración
         
-        # Verificar si el cache no ha expirado
-        return (datetime.now() - timestamp).seconds < self.max_cache_age
+        Args:
+            cache_key: Clave del cache
+            research_results: Resultados a guardar
+        """
+        # Guardar una copia privada: el llamador puede modificar la suya
+        research_results = copy.deepcopy(research_results)
+        now = time.monotonic()
+        with self._cache_lock:
+            if len(self.research_cache) >= RESEARCH_CACHE_SIZE:
+                # Descartar primero las entradas expiradas y, si no basta,
+                # la menos usada recientemente
+                for key in [k for k, (expires_at, _) in self.research_cache.items() if expires_at <= now]:
+                    del self.research_cache[key]
+                if len(self.research_cache) >= RESEARCH_CACHE_SIZE:
+                    del self.research_cache[next(iter(self.research_cache))]
+            
+            self.research_cache[cache_key] = (now + self.max_cache_age, research_results)
+    
+    def _schedule_refresh(self, cache_key: str, topic: str, context: Dict[str, Any] = None) -> None:
+        """
+        Actualizar una entrada expirada en un hilo de fondo
+        
+        Args:
+            cache_key: Clave del cache
+            topic: Tema a investigar
+            context: Contexto de los datos actuales
+        """
+        with self._cache_lock:
+            # Evitar actualizaciones paralelas de la misma clave
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+        
+        threading.Thread(target=self._refresh, args=(cache_key, topic, context), daemon=True).start()
+    
+    def _refresh(self, cache_key: str, topic: str, context: Dict[str, Any] = None) -> None:
+        """
+        Volver a investigar un tema y reemplazar su entrada en cache
+        
+        Args:
+            cache_key: Clave del cache
+            topic: Tema a investigar
+            context: Contexto de los datos actuales
+        """
+        try:
+            # Sin registro: nadie espera los mensajes de una actualización de fondo
+            self._run_research(cache_key, topic, context)
+        finally:
+            with self._cache_lock:
+                self._refreshing.discard(cache_key)
+    
+    @staticmethod
+    def render_log(messages: List[Tuple[str, str]]) -> None:
+        """
+        Mostrar en un único bloque los mensajes de una investigación
+        
+        Args:
+            messages: Mensajes (nivel, texto), p. ej. research_topic(...)['log']
+        """
+        if not messages:
+            return
+        
+        with st.expander(f"📋 Registro de investigación ({len(messages)})"):
+            for level, message in messages:
+                getattr(st, level)(message)
     
     def get_research_summary(self, research_results: Dict[str, Any]) -> str:
         """
@@ -685,3 +1075,18 @@ class ResearchAgent:
         
         return summary
 
+
+@st.cache_resource
+def get_research_agent() -> ResearchAgent:
+    """
+    Obtener la instancia compartida del agente de investigación
+    
+    Streamlit vuelve a ejecutar el script en cada interacción; construir
+    ResearchAgent() en cada rerun descartaría el cache de investigaciones y
+    las conexiones HTTP abiertas. Los llamadores deben usar esta función en
+    lugar de instanciar la clase directamente.
+    
+    Returns:
+        ResearchAgent: Agente compartido entre reruns y sesiones
+    """
+    return ResearchAgent()
@@ -5,13 +5,54 @@ This package contains the Research Agent specialized in searching for external
 information to complement insights with web research.
 """
 
+import importlib.util
+import os
+import sys
+
+# The full ResearchAgent lives in the sibling module ``research_agent.py``,
+# which this package shadows: ``from .research_agent import ...`` in
+# agents.extensions resolves here. Load that file by path once and
+# re-export its public names so those imports reach the real agent.
+_AGENT_MODULE = __name__ + '._agent'
+_AGENT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'research_agent.py')
+
+
+def _load_agent_module():
+    """Load the shadowed research_agent.py module, reusing it if already loaded."""
+    module = sys.modules.get(_AGENT_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(_AGENT_MODULE, _AGENT_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[_AGENT_MODULE] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[_AGENT_MODULE]
+            raise
+    return module
+
+
+__all__ = []
+
 # Import only the simple integration to avoid circular imports
 try:
-    from .simple_integration import SimpleResearchIntegration, simple_research_agent
-    __all__ = [
+    from .simple_integration import SimpleResearchIntegration, get_simple_research_agent
+    __all__ += [
         'SimpleResearchIntegration',
-        'simple_research_agent'
+        'get_simple_research_agent'
     ]
 except ImportError:
     # Fallback if there are import issues
-    __all__ = []
+    pass
+
+try:
+    _agent_module = _load_agent_module()
+    ResearchAgent = _agent_module.ResearchAgent
+    get_research_agent = _agent_module.get_research_agent
+    __all__ += [
+        'ResearchAgent',
+        'get_research_agent'
+    ]
+except ImportError:
+    # Fallback if the agent's dependencies (requests, streamlit) are missing
+    pass
@@ -6,21 +6,162 @@ This module provides a simplified interface for the Research Agent
 that works without external API dependencies.
 """
 
-import sys
-import os
-from typing import Dict, Any, List
-import pandas as pd
+import operator
+import re
+import unicodedata
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime
 
-# Add the current directory to the path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+# Aviation-related keywords that make a topic and an entry mutually relevant
+AVIATION_KEYWORDS = frozenset({
+    'aviación', 'aéreo', 'aerolíneas', 'pasajeros', 'tráfico',
+    'feriado', 'estacional', 'crecimiento', 'tendencia'
+})
 
-# Import ResearchAgent directly to avoid circular imports
-try:
-    from .research_agent import ResearchAgent
-except ImportError:
-    # Fallback if import fails
-    ResearchAgent = None
+# Maximum number of topics whose knowledge-base research is memoized
+_KNOWLEDGE_CACHE_SIZE = 256
+
+# Fields read by get_research_summary, all present in research_topic results
+_SUMMARY_FIELDS = operator.itemgetter('topic', 'sources', 'insights', 'recommendations', 'confidence')
+
+# Shared, read-only result used whenever external research is unavailable
+_EMPTY_EXTERNAL = MappingProxyType({
+    'sources': (),
+    'insights': (),
+    'recommendations': (),
+    'confidence': 0.0
+})
+
+# Recommendation priority markers; any other priority is shown as low
+_PRIORITY_EMOJI = {'high': '🔴', 'medium': '🟡'}
+
+# Topic-specific insights: (pattern, template), emitted in table order
+_INSIGHT_RULES = (
+    (re.compile(r'patr[óo]n|estacional', re.IGNORECASE), {
+        'type': 'pattern_insight',
+        'description': 'Los patrones estacionales en aviación son consistentes y predecibles, lo que permite planificación estratégica.',
+        'confidence': 0.8,
+        'source': 'análisis_interno'
+    }),
+    (re.compile(r'feriado|vacaciones', re.IGNORECASE), {
+        'type': 'holiday_insight',
+        'description': 'Los feriados crean oportunidades de negocio significativas en el sector aéreo.',
+        'confidence': 0.9,
+        'source': 'análisis_interno'
+    }),
+    (re.compile(r'crecimiento|tendencia', re.IGNORECASE), {
+        'type': 'growth_insight',
+        'description': 'El crecimiento en aviación está influenciado por factores económicos, tecnológicos y sociales.',
+        'confidence': 0.7,
+        'source': 'análisis_interno'
+    }),
+)
+
+# Topic-specific recommendations: (pattern, template), emitted in table order
+_RECOMMENDATION_RULES = (
+    (re.compile(r'an[áa]lisis', re.IGNORECASE), {
+        'type': 'analysis_recommendation',
+        'description': 'Considere aplicar filtros específicos para un análisis más detallado de los datos.',
+        'priority': 'medium'
+    }),
+    (re.compile(r'predicci[óo]n|pron[óo]stico', re.IGNORECASE), {
+        'type': 'prediction_recommendation',
+        'description': 'Use datos históricos para generar proyecciones futuras más precisas.',
+        'priority': 'high'
+    }),
+    (re.compile(r'comparaci[óo]n', re.IGNORECASE), {
+        'type': 'comparison_recommendation',
+        'description': 'Compare diferentes países o períodos para identificar diferencias significativas.',
+        'priority': 'medium'
+    }),
+    (re.compile(r'feriado', re.IGNORECASE), {
+        'type': 'holiday_recommendation',
+        'description': 'Analice el impacto específico de cada tipo de feriado en el tráfico aéreo.',
+        'priority': 'high'
+    }),
+)
+
+
+def _strip_accents(text: str) -> str:
+    """
+    Casefold a text and strip its accents, so "Aviación" matches "aviacion".
+    
+    Args:
+        text: Text to normalize
+        
+    Returns:
+        Lowercase ASCII form of the text
+    """
+    return unicodedata.normalize('NFKD', text.casefold()).encode('ascii', 'ignore').decode()
+
+
+# AVIATION_KEYWORDS in the accent-free form used for matching
+_AVIATION_KEYWORDS_ASCII = frozenset(_strip_accents(keyword) for keyword in AVIATION_KEYWORDS)
+
+
+# Punctuation treated as a word separator when tokenizing
+_PUNCT_TRANS = str.maketrans({c: ' ' for c in ',.;:!?()"\''})
+
+
+def _tokenize(text: str) -> frozenset:
+    """
+    Split an accent-free text into words, ignoring punctuation.
+    
+    Args:
+        text: Text already normalized with _strip_accents
+        
+    Returns:
+        Set of words in the text
+    """
+    return frozenset(text.translate(_PUNCT_TRANS).split())
+
+
+def _word_forms(word: str) -> tuple:
+    """
+    Approximate Spanish singular/plural forms of a word.
+    
+    Args:
+        word: Lowercase word
+        
+    Returns:
+        Tuple with the word and its variants
+    """
+    forms = [word, word + 's', word + 'es']
+    if len(word) > 3 and word.endswith('es'):
+        forms.append(word[:-2])
+    if len(word) > 2 and word.endswith('s'):
+        forms.append(word[:-1])
+    return tuple(forms)
+
+
+def _shorten(text: str, width: int, suffix: str = '...') -> str:
+    """
+    Truncate a text to a maximum width, marking the cut with a suffix.
+    
+    Args:
+        text: Text to shorten
+        width: Maximum number of characters kept from the text
+        suffix: Marker appended when the text is cut
+        
+    Returns:
+        The text unchanged if it fits, otherwise its first characters plus suffix
+    """
+    return text if len(text) <= width else text[:width] + suffix
+
+
+def _no_external_research(topic: str, context: Dict[str, Any] = None) -> Mapping[str, Any]:
+    """
+    Stand-in for ResearchAgent.research_topic when the agent is unavailable.
+    
+    Args:
+        topic: Topic to research
+        context: Optional context
+        
+    Returns:
+        Empty external research results
+    """
+    return _EMPTY_EXTERNAL
 
 
 class SimpleResearchIntegration:
@@ -30,67 +171,117 @@ class SimpleResearchIntegration:
     
     def __init__(self):
         """Initialize the simple integration."""
+        # Import ResearchAgent here, not at module level, so that importing
+        # this module (e.g. only for get_research_summary) stays cheap
+        try:
+            from .research_agent import ResearchAgent
+        except ImportError:
+            # Fallback if import fails
+            ResearchAgent = None
+        
         # Initialize agent only if ResearchAgent is available
         if ResearchAgent is not None:
             self.agent = ResearchAgent()
+            self._external_fn = self.agent.research_topic
         else:
             self.agent = None
+            self._external_fn = _no_external_research
         self.knowledge_base = self._initialize_knowledge_base()
+        self._index_knowledge_base()
+        self._knowledge_cache = {}
     
-    def _initialize_knowledge_base(self) -> Dict[str, List[Dict[str, Any]]]:
+    def _initialize_knowledge_base(self) -> Mapping[str, Tuple[Mapping[str, Any], ...]]:
         """
         Initialize a knowledge base with aviation-related information.
         
+        The knowledge base is shared by every session through the module
+        singleton, so it is built read-only: categories map to tuples of
+        read-only entry mappings.
+        
         Returns:
-            Dictionary containing knowledge base entries
+            Read-only mapping containing knowledge base entries
         """
-        return {
-            "patrones_estacionales": [
-                {
+        return MappingProxyType({
+            "patrones_estacionales": (
+                MappingProxyType({
                     "title": "Patrones Estacionales en Aviación",
                     "content": "Los patrones estacionales en la aviación muestran picos durante los meses de verano (junio-agosto) y feriados importantes como Navidad y Año Nuevo. Los meses de invierno suelen tener menor tráfico, excepto en destinos de esquí.",
                     "source": "Conocimiento Base",
                     "relevance_score": 0.9
-                }
-            ],
-            "impacto_feriados": [
-                {
+                }),
+            ),
+            "impacto_feriados": (
+                MappingProxyType({
                     "title": "Impacto de Feriados en Tráfico Aéreo",
                     "content": "Los feriados tienen un impacto significativo en el tráfico aéreo, con aumentos del 20-40% durante períodos festivos. Los feriados más impactantes incluyen Navidad, Año Nuevo, Semana Santa y feriados nacionales importantes.",
                     "source": "Conocimiento Base",
                     "relevance_score": 0.95
-                }
-            ],
-            "crecimiento_aviacion": [
-                {
+                }),
+            ),
+            "crecimiento_aviacion": (
+                MappingProxyType({
                     "title": "Crecimiento de la Industria Aérea",
                     "content": "La industria aérea ha mostrado un crecimiento promedio del 4-5% anual antes de la pandemia. La recuperación post-COVID-19 ha sido gradual, con patrones de crecimiento variables por región.",
                     "source": "Conocimiento Base",
                     "relevance_score": 0.85
-                }
-            ],
-            "tecnologia_aviacion": [
-                {
+                }),
+            ),
+            "tecnologia_aviacion": (
+                MappingProxyType({
                     "title": "Tecnología en Aviación",
                     "content": "Las nuevas tecnologías en aviación incluyen aviones más eficientes, sistemas de navegación avanzados, y mejoras en la experiencia del pasajero. La sostenibilidad es un foco importante con el desarrollo de combustibles alternativos.",
                     "source": "Conocimiento Base",
                     "relevance_score": 0.8
-                }
-            ],
-            "regulaciones_aereas": [
-                {
+                }),
+            ),
+            "regulaciones_aereas": (
+                MappingProxyType({
                     "title": "Regulaciones Aéreas Internacionales",
                     "content": "Las regulaciones aéreas internacionales están coordinadas por la OACI (Organización de Aviación Civil Internacional) y incluyen estándares de seguridad, emisiones, y operaciones. Cada país tiene sus propias regulaciones adicionales.",
                     "source": "Conocimiento Base",
                     "relevance_score": 0.75
-                }
-            ]
-        }
+                }),
+            )
+        })
+    
+    def _index_knowledge_base(self) -> None:
+        """
+        Build the lookup structures used by _search_knowledge_base.
+        
+        The knowledge base is static, so it is flattened once into
+        ``_kb_entries`` and indexed by content word (``_inverted_index``,
+        word -> entry positions) and by aviation keyword presence
+        (``_aviation_entry_ids``). A query then only touches the posting
+        lists of its own words instead of scanning every entry. Content
+        is indexed accent-free, so queries typed without accents match.
+        """
+        self._kb_entries = tuple(
+            entry
+            for category_entries in self.knowledge_base.values()
+            for entry in category_entries
+        )
+        
+        inverted_index = {}
+        aviation_entry_ids = []
+        for entry_id, entry in enumerate(self._kb_entries):
+            content_norm = _strip_accents(entry['content'])
+            for token in _tokenize(content_norm):
+                inverted_index.setdefault(token, []).append(entry_id)
+            if any(keyword in content_norm for keyword in _AVIATION_KEYWORDS_ASCII):
+                aviation_entry_ids.append(entry_id)
+        
+        self._inverted_index = {token: tuple(ids) for token, ids in inverted_index.items()}
+        self._aviation_entry_ids = frozenset(aviation_entry_ids)
     
     def research_topic(self, topic: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Research a topic using the knowledge base and external sources.
         
+        Knowledge base entries in ``sources`` and the dicts in ``insights``
+        and ``recommendations`` are shared with the per-topic cache, so they
+        are returned as read-only mappings; only the outer lists belong to
+        the caller.
+        
         Args:
             topic: Topic to research
             context: Optional context from the DataRush system
@@ -100,7 +291,7 @@ class SimpleResearchIntegration:
         """
         try:
             # First, try to get information from knowledge base
-            knowledge_results = self._search_knowledge_base(topic)
+            knowledge_results, insights, recommendations, knowledge_confidence = self._research_knowledge_base(topic)
             
             # Then, try external research if available
             external_results = self._try_external_research(topic, context)
@@ -109,10 +300,10 @@ class SimpleResearchIntegration:
             combined_results = {
                 'topic': topic,
                 'timestamp': datetime.now().isoformat(),
-                'sources': knowledge_results + external_results.get('sources', []),
-                'insights': self._generate_insights_from_knowledge(topic, knowledge_results),
-                'recommendations': self._generate_recommendations_from_topic(topic),
-                'confidence': self._calculate_combined_confidence(knowledge_results, external_results)
+                'sources': [*knowledge_results, *external_results.get('sources', ())],
+                'insights': list(insights),
+                'recommendations': list(recommendations),
+                'confidence': self._calculate_combined_confidence(knowledge_confidence, external_results)
             }
             
             return combined_results
@@ -124,55 +315,71 @@ class SimpleResearchIntegration:
                 "analysis_type": "research_error"
             }
     
-    def _search_knowledge_base(self, topic: str) -> List[Dict[str, Any]]:
+    def _research_knowledge_base(self, topic: str) -> tuple:
         """
-        Search the knowledge base for relevant information.
+        Knowledge-base part of a research, memoized per topic.
+        
+        The knowledge base is static and this part does not depend on the
+        context, so repeated topics (e.g. on Streamlit reruns) skip the
+        search and the insight/recommendation rules. Only the external
+        research and the timestamp are recomputed on every call.
         
         Args:
-            topic: Topic to search for
+            topic: Topic to research
             
         Returns:
-            List of relevant knowledge base entries
+            Tuple of (knowledge entries, insights, recommendations) tuples of
+            read-only mappings and the average relevance of the entries (None
+            if there are none)
         """
-        results = []
-        topic_lower = topic.lower()
-        
-        # Search through knowledge base categories
-        for category, entries in self.knowledge_base.items():
-            for entry in entries:
-                # Check if topic keywords match entry content
-                if self._is_relevant(topic_lower, entry['content'].lower()):
-                    results.append(entry)
+        cached = self._knowledge_cache.get(topic)
+        if cached is not None:
+            return cached
         
-        return results
+        knowledge_results = self._search_knowledge_base(topic)
+        knowledge_confidence = None
+        if knowledge_results:
+            knowledge_confidence = sum(result.get('relevance_score', 0.5) for result in knowledge_results) / len(knowledge_results)
+        # Freeze insights and recommendations like the knowledge base
+        # entries: the cached tuples are shared by every later call and session
+        cached = (
+            tuple(knowledge_results),
+            tuple(MappingProxyType(insight) for insight in self._generate_insights_from_knowledge(topic, knowledge_results)),
+            tuple(MappingProxyType(rec) for rec in self._generate_recommendations_from_topic(topic)),
+            knowledge_confidence
+        )
+        
+        if len(self._knowledge_cache) >= _KNOWLEDGE_CACHE_SIZE:
+            del self._knowledge_cache[next(iter(self._knowledge_cache))]
+        self._knowledge_cache[topic] = cached
+        return cached
     
-    def _is_relevant(self, topic: str, content: str) -> bool:
+    def _search_knowledge_base(self, topic: str) -> List[Dict[str, Any]]:
         """
-        Check if content is relevant to the topic.
+        Search the knowledge base for relevant information.
         
         Args:
-            topic: Search topic
-            content: Content to check
+            topic: Topic to search for
             
         Returns:
-            True if relevant, False otherwise
+            List of relevant knowledge base entries
         """
-        # Extract keywords from topic
-        topic_words = set(topic.split())
-        content_words = set(content.split())
-        
-        # Check for common words
-        common_words = topic_words.intersection(content_words)
-        
-        # Check for aviation-related keywords
-        aviation_keywords = ['aviación', 'aéreo', 'aerolíneas', 'pasajeros', 'tráfico', 'feriado', 'estacional', 'crecimiento', 'tendencia']
-        topic_has_aviation = any(keyword in topic for keyword in aviation_keywords)
-        content_has_aviation = any(keyword in content for keyword in aviation_keywords)
-        
-        # Relevance if there are common words or both have aviation keywords
-        return len(common_words) > 0 or (topic_has_aviation and content_has_aviation)
+        topic_norm = _strip_accents(topic)
+        
+        # An entry is relevant if it shares a word with the topic (in singular
+        # or plural form, ignoring accents), or if both mention an aviation
+        # keyword
+        candidate_ids = set()
+        for token in _tokenize(topic_norm):
+            for form in _word_forms(token):
+                candidate_ids.update(self._inverted_index.get(form, ()))
+        if any(keyword in topic_norm for keyword in _AVIATION_KEYWORDS_ASCII):
+            candidate_ids.update(self._aviation_entry_ids)
+        
+        # Keep knowledge base order
+        return [self._kb_entries[entry_id] for entry_id in sorted(candidate_ids)]
     
-    def _try_external_research(self, topic: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _try_external_research(self, topic: str, context: Dict[str, Any] = None) -> Mapping[str, Any]:
         """
         Try to perform external research using the full ResearchAgent.
         
@@ -184,26 +391,11 @@ class SimpleResearchIntegration:
             Dictionary with external research results
         """
         try:
-            # Check if ResearchAgent is available
-            if ResearchAgent is None:
-                return {
-                    'sources': [],
-                    'insights': [],
-                    'recommendations': [],
-                    'confidence': 0.0
-                }
-            
-            # Try to use the full research agent
-            external_results = self.agent.research_topic(topic, context)
-            return external_results
-        except Exception as e:
+            # Bound at init to the full research agent, or to an empty result
+            return self._external_fn(topic, context)
+        except Exception:
             # If external research fails, return empty results
-            return {
-                'sources': [],
-                'insights': [],
-                'recommendations': [],
-                'confidence': 0.0
-            }
+            return _EMPTY_EXTERNAL
     
     def _generate_insights_from_knowledge(self, topic: str, knowledge_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -221,36 +413,14 @@ class SimpleResearchIntegration:
         for result in knowledge_results:
             insight = {
                 'type': 'knowledge_insight',
-                'description': f"Basado en {result['source']}: {result['content'][:100]}...",
+                'description': f"Basado en {result['source']}: {_shorten(result['content'], 100)}",
                 'confidence': result.get('relevance_score', 0.5),
                 'source': result['source']
             }
             insights.append(insight)
         
         # Add topic-specific insights
-        if 'patrón' in topic.lower() or 'estacional' in topic.lower():
-            insights.append({
-                'type': 'pattern_insight',
-                'description': 'Los patrones estacionales en aviación son consistentes y predecibles, lo que permite planificación estratégica.',
-                'confidence': 0.8,
-                'source': 'análisis_interno'
-            })
-        
-        if 'feriado' in topic.lower() or 'vacaciones' in topic.lower():
-            insights.append({
-                'type': 'holiday_insight',
-                'description': 'Los feriados crean oportunidades de negocio significativas en el sector aéreo.',
-                'confidence': 0.9,
-                'source': 'análisis_interno'
-            })
-        
-        if 'crecimiento' in topic.lower() or 'tendencia' in topic.lower():
-            insights.append({
-                'type': 'growth_insight',
-                'description': 'El crecimiento en aviación está influenciado por factores económicos, tecnológicos y sociales.',
-                'confidence': 0.7,
-                'source': 'análisis_interno'
-            })
+        insights.extend(dict(template) for pattern, template in _INSIGHT_RULES if pattern.search(topic))
         
         return insights
     
@@ -264,44 +434,15 @@ class SimpleResearchIntegration:
         Returns:
             List of recommendations
         """
-        recommendations = []
-        
-        if 'análisis' in topic.lower():
-            recommendations.append({
-                'type': 'analysis_recommendation',
-                'description': 'Considere aplicar filtros específicos para un análisis más detallado de los datos.',
-                'priority': 'medium'
-            })
-        
-        if 'predicción' in topic.lower() or 'pronóstico' in topic.lower():
-            recommendations.append({
-                'type': 'prediction_recommendation',
-                'description': 'Use datos históricos para generar proyecciones futuras más precisas.',
-                'priority': 'high'
-            })
-        
-        if 'comparación' in topic.lower():
-            recommendations.append({
-                'type': 'comparison_recommendation',
-                'description': 'Compare diferentes países o períodos para identificar diferencias significativas.',
-                'priority': 'medium'
-            })
-        
-        if 'feriado' in topic.lower():
-            recommendations.append({
-                'type': 'holiday_recommendation',
-                'description': 'Analice el impacto específico de cada tipo de feriado en el tráfico aéreo.',
-                'priority': 'high'
-            })
-        
-        return recommendations
+        return [dict(template) for pattern, template in _RECOMMENDATION_RULES if pattern.search(topic)]
     
-    def _calculate_combined_confidence(self, knowledge_results: List[Dict[str, Any]], external_results: Dict[str, Any]) -> float:
+    def _calculate_combined_confidence(self, knowledge_confidence: Optional[float], external_results: Dict[str, Any]) -> float:
         """
         Calculate combined confidence score.
         
         Args:
-            knowledge_results: Results from knowledge base
+            knowledge_confidence: Average relevance of the knowledge base
+                results, or None if there were none
             external_results: Results from external research
             
         Returns:
@@ -310,9 +451,8 @@ class SimpleResearchIntegration:
         confidence = 0.0
         
         # Base confidence from knowledge results
-        if knowledge_results:
-            avg_knowledge_confidence = sum(result.get('relevance_score', 0.5) for result in knowledge_results) / len(knowledge_results)
-            confidence += avg_knowledge_confidence * 0.6
+        if knowledge_confidence is not None:
+            confidence += knowledge_confidence * 0.6
         
         # Add external research confidence
         external_confidence = external_results.get('confidence', 0.0)
@@ -341,47 +481,70 @@ class SimpleResearchIntegration:
         if research_results.get("error", False):
             return f"❌ Error: {research_results.get('message', 'Error desconocido')}"
         
-        topic = research_results.get('topic', 'Tema desconocido')
-        sources = research_results.get('sources', [])
-        insights = research_results.get('insights', [])
-        recommendations = research_results.get('recommendations', [])
-        confidence = research_results.get('confidence', 0.0)
+        try:
+            topic, sources, insights, recommendations, confidence = _SUMMARY_FIELDS(research_results)
+        except KeyError:
+            # Partial results not produced by research_topic
+            topic = research_results.get('topic', 'Tema desconocido')
+            sources = research_results.get('sources', [])
+            insights = research_results.get('insights', [])
+            recommendations = research_results.get('recommendations', [])
+            confidence = research_results.get('confidence', 0.0)
         
         # Create narrative summary
-        summary = f"## 🔍 Investigación: {topic}\n\n"
+        parts = [f"## 🔍 Investigación: {topic}\n\n"]
         
         # Add sources summary
         if sources:
-            summary += f"**📚 Fuentes encontradas:** {len(sources)}\n\n"
+            parts.append(f"**📚 Fuentes encontradas:** {len(sources)}\n\n")
             for source in sources[:3]:  # Show first 3 sources
-                summary += f"• **{source.get('source', 'Fuente desconocida')}**: {source.get('title', 'Sin título')}\n"
-                if source.get('content'):
-                    content_preview = source['content'][:150] + "..." if len(source['content']) > 150 else source['content']
-                    summary += f"  {content_preview}\n"
-                summary += "\n"
+                parts.append(f"• **{source.get('source', 'Fuente desconocida')}**: {source.get('title', 'Sin título')}\n")
+                content = source.get('content')
+                if content:
+                    parts.append(f"  {_shorten(content, 150)}\n")
+                parts.append("\n")
         
         # Add insights summary
         if insights:
-            summary += f"**💡 Insights generados:** {len(insights)}\n\n"
+            parts.append(f"**💡 Insights generados:** {len(insights)}\n\n")
             for insight in insights[:3]:  # Show first 3 insights
-                summary += f"• {insight.get('description', 'Sin descripción')}\n"
-                summary += f"  *Confianza: {insight.get('confidence', 0):.1%}*\n\n"
+                parts.append(f"• {insight.get('description', 'Sin descripción')}\n")
+                parts.append(f"  *Confianza: {insight.get('confidence', 0):.1%}*\n\n")
         
         # Add recommendations summary
         if recommendations:
-            summary += f"**🎯 Recomendaciones:** {len(recommendations)}\n\n"
+            parts.append(f"**🎯 Recomendaciones:** {len(recommendations)}\n\n")
             for rec in recommendations[:3]:  # Show first 3 recommendations
-                priority = rec.get('priority', 'medium')
-                priority_emoji = "🔴" if priority == 'high' else "🟡" if priority == 'medium' else "🟢"
-                summary += f"• {priority_emoji} {rec.get('description', 'Sin descripción')}\n"
-            summary += "\n"
+                priority_emoji = _PRIORITY_EMOJI.get(rec.get('priority', 'medium'), "🟢")
+                parts.append(f"• {priority_emoji} {rec.get('description', 'Sin descripción')}\n")
+            parts.append("\n")
         
         # Add confidence
         confidence_emoji = "🟢" if confidence > 0.7 else "🟡" if confidence > 0.4 else "🔴"
-        summary += f"**📊 Confianza general:** {confidence_emoji} {confidence:.1%}\n"
+        parts.append(f"**📊 Confianza general:** {confidence_emoji} {confidence:.1%}\n")
         
-        return summary
+        return "".join(parts)
+
+
+# Global instance, created on first use
+_instance = None
+
+
+def get_simple_research_agent() -> SimpleResearchIntegration:
+    """
+    Get the shared SimpleResearchIntegration, creating it on first use.
+    
+    Returns:
+        The global research integration instance
+    """
+    global _instance
+    if _instance is None:
+        _instance = SimpleResearchIntegration()
+    return _instance
 
 
-# Create a global instance for easy access
-simple_research_agent = SimpleResearchIntegration()
+def __getattr__(name: str) -> Any:
+    """Keep ``simple_research_agent`` importable as a lazily created global."""
+    if name == 'simple_research_agent':
+        return get_simple_research_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
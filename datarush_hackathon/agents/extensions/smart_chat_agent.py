@@ -1,21 +1,80 @@
 # agents/extensions/smart_chat_agent.py
 import streamlit as st
 import google.generativeai as genai
+from google.api_core import exceptions as api_exceptions
+from google.api_core import retry as api_retry
 from typing import Dict, List, Optional
 import os
+import re
+import threading
+from types import MappingProxyType
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-# Import ResearchAgent with fallback to avoid circular imports
+# Import the shared ResearchAgent factory with fallback to avoid circular imports
 try:
-    from .research_agent import ResearchAgent
+    from .research_agent import get_research_agent
 except ImportError:
-    ResearchAgent = None
+    get_research_agent = None
 
 # Cargar variables de entorno
 load_dotenv()
 
+# Máximo de respuestas generales de Gemini guardadas en caché
+GENERAL_RESPONSE_CACHE_SIZE = 512
+
+# Máximo de llamadas simultáneas a Gemini, compartido por todas las sesiones
+GEMINI_MAX_CONCURRENCY = 5
+
+# Reintentos con backoff exponencial ante cuota agotada (429) o servicio caído,
+# y tiempo máximo por llamada
+GEMINI_REQUEST_OPTIONS = {
+    'retry': api_retry.Retry(
+        predicate=api_retry.if_exception_type(
+            api_exceptions.ResourceExhausted,
+            api_exceptions.ServiceUnavailable
+        ),
+        initial=1.0,
+        maximum=16.0,
+        multiplier=2.0,
+        timeout=60.0
+    ),
+    'timeout': 30.0
+}
+
+_gemini_slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+
+# Sección vacía compartida para partes del contexto que faltan
+_EMPTY_SECTION = MappingProxyType({})
+
+# Herramientas de consulta disponibles: (método, descripción)
+_TOOLS = (
+    ('query_passenger_data', 'Consultar datos de pasajeros'),
+    ('query_holiday_data', 'Consultar datos de feriados'),
+    ('compare_countries', 'Comparar países'),
+    ('analyze_patterns', 'Analizar patrones'),
+    ('generate_insights', 'Generar insights'),
+    ('research_topic', 'Investigar tema específico con fuentes externas'),
+)
+
+# Palabras clave que activan cada herramienta, en orden de prioridad
+_ROUTE_KEYWORDS = (
+    ('query_passenger_data', ('pasajero', 'pasajeros', 'passenger', 'volumen')),
+    ('query_holiday_data', ('feriado', 'feriados', 'holiday', 'vacaciones')),
+    ('compare_countries', ('comparar', 'comparación', 'vs', 'versus', 'diferencia')),
+    ('analyze_patterns', ('patrón', 'patrones', 'tendencia', 'análisis')),
+    ('generate_insights', ('insight', 'insights', 'recomendación', 'conclusión')),
+    ('research_topic', ('investigar', 'investigación', 'buscar', 'información', 'fuentes', 'externa')),
+)
+
+# Una expresión precompilada por herramienta, para buscar todas sus palabras
+# clave en una sola pasada sobre el mensaje
+_ROUTES = tuple(
+    (tool_name, re.compile('|'.join(map(re.escape, keywords))))
+    for tool_name, keywords in _ROUTE_KEYWORDS
+)
+
 class SmartChatAgent:
     """
     Clase para manejar chat inteligente con herramientas avanzadas
@@ -26,9 +85,10 @@ class SmartChatAgent:
         self.model = None
         self.chat_history = []
         self.tools = []
-        # Initialize ResearchAgent only if available
-        if ResearchAgent is not None:
-            self.research_agent = ResearchAgent()
+        self._response_cache = {}
+        # Reuse the shared ResearchAgent only if available
+        if get_research_agent is not None:
+            self.research_agent = get_research_agent()
         else:
             self.research_agent = None
         self.setup_smart_chat_agent()
@@ -59,35 +119,11 @@ class SmartChatAgent:
         """
         return [
             {
-                'name': 'query_passenger_data',
-                'description': 'Consultar datos de pasajeros',
-                'function': self.query_passenger_data
-            },
-            {
-                'name': 'query_holiday_data',
-                'description': 'Consultar datos de feriados',
-                'function': self.query_holiday_data
-            },
-            {
-                'name': 'compare_countries',
-                'description': 'Comparar países',
-                'function': self.compare_countries
-            },
-            {
-                'name': 'analyze_patterns',
-                'description': 'Analizar patrones',
-                'function': self.analyze_patterns
-            },
-            {
-                'name': 'generate_insights',
-                'description': 'Generar insights',
-                'function': self.generate_insights
-            },
-            {
-                'name': 'research_topic',
-                'description': 'Investigar tema específico con fuentes externas',
-                'function': self.research_topic
+                'name': name,
+                'description': description,
+                'function': getattr(self, name)
             }
+            for name, description in _TOOLS
         ]
     
     def process_smart_message(self, message: str, context: Dict) -> str:
@@ -134,21 +170,12 @@ class SmartChatAgent:
         """
         message_lower = message.lower()
         
-        # Detectar tipo de consulta
-        if any(word in message_lower for word in ['pasajero', 'pasajeros', 'passenger', 'volumen']):
-            return self.query_passenger_data(message, context)
-        elif any(word in message_lower for word in ['feriado', 'feriados', 'holiday', 'vacaciones']):
-            return self.query_holiday_data(message, context)
-        elif any(word in message_lower for word in ['comparar', 'comparación', 'vs', 'versus', 'diferencia']):
-            return self.compare_countries(message, context)
-        elif any(word in message_lower for word in ['patrón', 'patrones', 'tendencia', 'análisis']):
-            return self.analyze_patterns(message, context)
-        elif any(word in message_lower for word in ['insight', 'insights', 'recomendación', 'conclusión']):
-            return self.generate_insights(message, context)
-        elif any(word in message_lower for word in ['investigar', 'investigación', 'buscar', 'información', 'fuentes', 'externa']):
-            return self.research_topic(message, context)
-        else:
-            return self._generate_general_response(message, context)
+        # Detectar tipo de consulta: la primera herramienta con alguna palabra clave
+        for tool_name, pattern in _ROUTES:
+            if pattern.search(message_lower):
+                return getattr(self, tool_name)(message, context)
+        
+        return self._generate_general_response(message, context)
     
     def query_passenger_data(self, query: str, context: Dict) -> str:
         """
@@ -161,15 +188,15 @@ class SmartChatAgent:
         Returns:
             str: Respuesta sobre datos de pasajeros
         """
-        passengers = context.get('passengers', {})
+        passengers = context.get('passengers') or _EMPTY_SECTION
+        total_records = passengers.get('total_records', 0)
         
-        if not passengers or passengers.get('total_records', 0) == 0:
+        if total_records == 0:
             return "No hay datos de pasajeros disponibles en este momento."
         
         # Análisis básico
         total_passengers = passengers.get('total_passengers', 0)
         countries_count = passengers.get('countries', 0)
-        total_records = passengers.get('total_records', 0)
         
         response = f"""
         📊 **Análisis de Datos de Pasajeros:**
@@ -199,14 +226,14 @@ class SmartChatAgent:
         Returns:
             str: Respuesta sobre datos de feriados
         """
-        holidays = context.get('holidays', {})
+        holidays = context.get('holidays') or _EMPTY_SECTION
+        total_holidays = holidays.get('total_records', 0)
         
-        if not holidays or holidays.get('total_records', 0) == 0:
+        if total_holidays == 0:
             return "No hay datos de feriados disponibles en este momento."
         
-        total_holidays = holidays.get('total_records', 0)
         countries_count = holidays.get('countries', 0)
-        holiday_types = holidays.get('holiday_types', [])
+        holiday_types = holidays.get('holiday_types', ())
         
         response = f"""
         🎉 **Análisis de Datos de Feriados:**
@@ -236,7 +263,7 @@ class SmartChatAgent:
         Returns:
             str: Respuesta de comparación
         """
-        countries = context.get('countries', {}).get('countries_list', [])
+        countries = (context.get('countries') or _EMPTY_SECTION).get('countries_list', ())
         
         if not countries:
             return "No hay datos de países disponibles para comparar."
@@ -326,11 +353,8 @@ class SmartChatAgent:
         Returns:
             str: Respuesta con insights
         """
-        passengers = context.get('passengers', {})
-        holidays = context.get('holidays', {})
-        
-        total_passengers = passengers.get('total_passengers', 0)
-        total_holidays = holidays.get('total_records', 0)
+        total_passengers = (context.get('passengers') or _EMPTY_SECTION).get('total_passengers', 0)
+        total_holidays = (context.get('holidays') or _EMPTY_SECTION).get('total_records', 0)
         
         response = f"""
         �� **Insights y Recomendaciones:**
@@ -381,6 +405,13 @@ class SmartChatAgent:
             # Usar Gemini para respuesta general
             context_info = self._create_context_info(context)
             
+            # El prompt solo depende del mensaje y del contexto resumido, así
+            # que una misma pregunta sobre los mismos datos reutiliza la respuesta
+            cache_key = (" ".join(message.lower().split()), context_info)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
             prompt = f"""
             Eres un analista de datos especializado en patrones de feriados y tráfico aéreo.
             
@@ -391,7 +422,12 @@ class SmartChatAgent:
             Responde de manera profesional y útil, proporcionando insights basados en los datos disponibles.
             """
             
-            response = self.model.generate_content(prompt)
+            with _gemini_slots:
+                response = self.model.generate_content(prompt, request_options=GEMINI_REQUEST_OPTIONS)
+            
+            if len(self._response_cache) >= GENERAL_RESPONSE_CACHE_SIZE:
+                del self._response_cache[next(iter(self._response_cache))]
+            self._response_cache[cache_key] = response.text
             return response.text
         else:
             # Respuesta predefinida
@@ -429,6 +465,7 @@ class SmartChatAgent:
             # Realizar investigación
             if self.research_agent is not None:
                 research_results = self.research_agent.research_topic(topic, context)
+                self.research_agent.render_log(research_results.get('log', ()))
             else:
                 return "El agente de investigación no está disponible en este momento."
             
@@ -538,18 +575,18 @@ class SmartChatAgent:
         if context and any(key in context for key in ['passengers', 'holidays', 'filters']):
             response += "**📈 Contexto de tus datos:**\n"
             
-            if 'passengers' in context and context['passengers']:
-                passengers = context['passengers']
+            passengers = context.get('passengers')
+            if passengers:
                 total_records = passengers.get('total_records', 0)
                 response += f"• Tienes {total_records:,} registros de pasajeros\n"
             
-            if 'holidays' in context and context['holidays']:
-                holidays = context['holidays']
+            holidays = context.get('holidays')
+            if holidays:
                 total_holidays = holidays.get('total_records', 0)
                 response += f"• Tienes {total_holidays:,} registros de feriados\n"
             
-            if 'filters' in context and context['filters']:
-                filters = context['filters']
+            filters = context.get('filters')
+            if filters:
                 if 'year_range' in filters:
                     year_min, year_max = filters['year_range']
                     response += f"• Análisis limitado al período {year_min}-{year_max}\n"
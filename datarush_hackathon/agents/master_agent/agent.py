@@ -15,7 +15,7 @@ import pandas as pd
 # Import specialized agents
 from ..extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent
 from ..extensions.business_advisor_agent.simple_integration import simple_business_advisor
-from ..extensions.research_agent.simple_integration import simple_research_agent
+from ..extensions.research_agent.simple_integration import get_simple_research_agent
 from ..core.chat_agent import ChatAgent
 from .enhanced_workflows import enhanced_workflows
 
@@ -36,7 +36,7 @@ class MasterAgent:
         self.agents = {
             'data_analysis': simple_data_analysis_agent,
             'business_advisor': simple_business_advisor,
-            'research': simple_research_agent,
+            'research': get_simple_research_agent(),
             'chat': ChatAgent()
         }
         
@@ -13,7 +13,7 @@ from components.visualizations import Visualizations
 from components.chat_agent import ChatAgent
 from agents.extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent
 from agents.extensions.business_advisor_agent.simple_integration import simple_business_advisor
-from agents.extensions.research_agent.simple_integration import simple_research_agent
+from agents.extensions.research_agent.simple_integration import get_simple_research_agent
 from agents.master_agent.simple_integration import simple_master_agent
 
 def main():
@@ -82,7 +82,7 @@ def main():
         
         with col_header2:
             if filtered_data.get('passengers') is not None and not filtered_data['passengers'].empty:
-                total_passengers = filtered_data['passengers']['Total'].sum()
+                total_passengers = filtered_data['passengers']['Total'].astype('float64').sum()
                 st.metric("Total Pasajeros", f"{total_passengers:,.0f}")
             else:
                 st.metric("Total Pasajeros", "0")
@@ -112,7 +112,7 @@ def main():
         
         with col_header6:
             if filtered_data.get('passengers') is not None and not filtered_data['passengers'].empty:
-                avg_passengers = filtered_data['passengers']['Total'].mean()
+                avg_passengers = filtered_data['passengers']['Total'].astype('float64').mean()
                 st.metric("Promedio Pasajeros", f"{avg_passengers:,.0f}")
             else:
                 st.metric("Promedio Pasajeros", "0")
@@ -200,7 +200,7 @@ def main():
                 
                 with col1:
                     if filtered_data.get('passengers') is not None and not filtered_data['passengers'].empty:
-                        total_passengers = filtered_data['passengers']['Total'].sum()
+                        total_passengers = filtered_data['passengers']['Total'].astype('float64').sum()
                         st.metric("Total Pasajeros", f"{total_passengers:,.0f}")
                     else:
                         st.metric("Total Pasajeros", "0")
@@ -356,12 +356,12 @@ def main():
                                     response = simple_business_advisor.get_business_summary(business_results)
                             elif agent_type == "Investigador":
                                 # Usar el agente investigador
-                                research_results = simple_research_agent.research_topic(user_input, context)
+                                research_results = get_simple_research_agent().research_topic(user_input, context)
                                 
                                 if research_results.get("error", False):
                                     response = f"❌ Error: {research_results.get('message', 'Error desconocido')}"
                                 else:
-                                    response = simple_research_agent.get_research_summary(research_results)
+                                    response = get_simple_research_agent().get_research_summary(research_results)
                             else:
                                 # Usar el chat agent original
                                 response = chat_agent.process_user_message(user_input, context)
@@ -405,12 +405,12 @@ def main():
                             response = simple_business_advisor.get_business_summary(business_results)
                     elif agent_type == "Investigador":
                         # Usar el agente investigador
-                        research_results = simple_research_agent.research_topic(user_input, context)
+                        research_results = get_simple_research_agent().research_topic(user_input, context)
                         
                         if research_results.get("error", False):
                             response = f"❌ Error: {research_results.get('message', 'Error desconocido')}"
                         else:
-                            response = simple_research_agent.get_research_summary(research_results)
+                            response = get_simple_research_agent().get_research_summary(research_results)
                     else:
                         # Usar el chat agent original
                         response = chat_agent.process_user_message(user_input, context)
@@ -71,9 +71,9 @@ class DataLoader:
             
             # Limpiar datos de feriados
             self.holidays_data['Date'] = pd.to_datetime(self.holidays_data['Date'])
-            self.holidays_data['Year'] = self.holidays_data['Date'].dt.year
-            self.holidays_data['Month'] = self.holidays_data['Date'].dt.month
-            self.holidays_data['Day'] = self.holidays_data['Date'].dt.day
+            self.holidays_data['Year'] = self.holidays_data['Date'].dt.year.astype('int16')
+            self.holidays_data['Month'] = self.holidays_data['Date'].dt.month.astype('int8')
+            self.holidays_data['Day'] = self.holidays_data['Date'].dt.day.astype('int8')
             self.holidays_data['Weekday'] = self.holidays_data['Date'].dt.day_name()
             
             # Limpiar datos de pasajeros
@@ -116,6 +116,9 @@ class DataLoader:
             # Solo eliminar filas donde Total es completamente inválido
             self.passengers_data = self.passengers_data[self.passengers_data['Total'].notna()]
             
+            # Reducir tipos numéricos: las agregaciones sobre Total están limitadas por memoria
+            self.passengers_data = self.passengers_data.astype({'Total': 'float32', 'Year': 'int16', 'Month': 'int8'})
+            
             print(f"✅ Datos de pasajeros procesados: {len(self.passengers_data)} registros válidos")
             print(f"✅ Países únicos después de procesar: {self.passengers_data['ISO3'].nunique()}")
             print(f"✅ Rango de pasajeros: {self.passengers_data['Total'].min():.0f} - {self.passengers_data['Total'].max():.0f}")
@@ -168,7 +171,7 @@ class DataLoader:
                 "total_records": len(passengers),
                 "countries": passengers['ISO3'].nunique(),
                 "date_range": f"{passengers['Year'].min()} a {passengers['Year'].max()}",
-                "total_passengers": passengers['Total'].sum()
+                "total_passengers": passengers['Total'].astype('float64').sum()
             },
             "countries": {
                 "total_countries": len(countries),
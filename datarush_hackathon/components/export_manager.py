@@ -298,7 +298,7 @@ class ExportManager:
         summary = [['Métrica', 'Valor']]
         
         if 'passengers' in data and not data['passengers'].empty:
-            total_passengers = data['passengers']['Total'].sum()
+            total_passengers = data['passengers']['Total'].astype('float64').sum()
             countries_count = data['passengers']['ISO3'].nunique()
             summary.append(['Total Pasajeros', f"{total_passengers:,.0f}"])
             summary.append(['Países con Datos', str(countries_count)])
@@ -332,7 +332,7 @@ class ExportManager:
         
         if 'passengers' in data and not data['passengers'].empty:
             passengers = data['passengers']
-            total_passengers = passengers['Total'].sum()
+            total_passengers = passengers['Total'].astype('float64').sum()
             insights.append(f"Se analizaron {total_passengers:,.0f} pasajeros en total")
             
             # Mes con más pasajeros
@@ -256,8 +256,8 @@ class Visualizations:
         
         if not passengers.empty and not passengers['Total'].isna().all():
             # Métricas de pasajeros
-            metrics['total_passengers'] = passengers['Total'].sum()
-            metrics['avg_passengers'] = passengers['Total'].mean()
+            metrics['total_passengers'] = passengers['Total'].astype('float64').sum()
+            metrics['avg_passengers'] = passengers['Total'].astype('float64').mean()
             metrics['max_passengers'] = passengers['Total'].max()
             metrics['countries_with_data'] = passengers['ISO3'].nunique()
             
@@ -13,7 +13,7 @@ from datetime import datetime
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agents.extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent
+from agents.extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent, _find_country
 
 
 def test_country_analysis():
@@ -168,6 +168,14 @@ def test_country_detection():
     print("✅ Country detection testing completed!")
 
 
+def test_country_alias_matching():
+    """Test that aliases match whole words and names win over two-letter codes."""
+    assert _find_country("datos de letonia") == "LVA"
+    assert _find_country("¿cómo se compara méxico con otros países?") == "MEX"
+    assert _find_country("patrón estacional por mes") is None
+    assert _find_country("tráfico en united states") == "USA"
+
+
 if __name__ == "__main__":
     print("🚀 Starting Country Analysis Tests")
     print("=" * 60)
@@ -142,6 +142,77 @@ def test_agent_tools():
     print("\n✅ Agent Tools testing completed!")
 
 
+def test_tool_totals_accumulate_float32_data_in_float64():
+    """Float32 Total columns give exact, JSON-serializable tool metrics."""
+    import json
+    import numpy as np
+    from agents.extensions.data_analysis_agent.tools import (
+        analyze_trends, analyze_geographic_distribution, analyze_seasonal_patterns,
+        perform_statistical_analysis, compare_countries
+    )
+    
+    rows = 24000
+    passengers = pd.DataFrame({
+        'ISO3': np.where(np.arange(rows) % 2 == 0, 'USA', 'MEX'),
+        'Year': (2000 + np.arange(rows) // 1000).astype('int16'),
+        'Month': (np.arange(rows) % 12 + 1).astype('int8'),
+        'Total': np.full(rows, 1234.567, dtype='float32')
+    })
+    data = {"passengers": passengers}
+    expected_total = float(passengers['Total'].to_numpy(dtype=np.float64).sum())
+    
+    trends = analyze_trends(data, include_visualization=False)
+    geographic = analyze_geographic_distribution(data, include_visualization=False)
+    comparison = compare_countries(data, include_visualization=False)
+    seasonal = analyze_seasonal_patterns(data, include_visualization=False)
+    statistical = perform_statistical_analysis(data, include_visualization=False)
+    
+    for result in (trends, geographic, comparison):
+        assert result["total_passengers"] == expected_total
+    
+    metrics = {
+        "total_passengers": trends["total_passengers"],
+        "avg_per_period": trends["avg_per_period"],
+        "growth_rate": trends["growth_rate"],
+        "avg_per_country": geographic["avg_per_country"],
+        "seasonal_variation": seasonal["seasonal_variation"],
+        "mode": statistical["mode"],
+    }
+    json.dumps(metrics)
+
+
+def test_aggregate_cache_hit_miss_and_eviction():
+    """Aggregations are reused per frame and filters and dropped with the frame."""
+    import gc
+    from agents.extensions.data_analysis_agent import tools
+    
+    passengers = pd.DataFrame({
+        'ISO3': ['USA', 'USA', 'MEX', 'MEX'],
+        'Year': [2020, 2021, 2020, 2021],
+        'Month': [1, 1, 2, 2],
+        'Total': [100.0, 200.0, 300.0, 400.0]
+    })
+    
+    # Miss, then hit: the same object comes back without recomputing
+    by_year = tools._get_aggregate(passengers, None, 'by_year')
+    assert by_year.to_dict() == {2020: 400.0, 2021: 600.0}
+    assert tools._get_aggregate(passengers, None, 'by_year') is by_year
+    
+    # Other filters are a separate entry for the same frame
+    filters = {'countries': ['USA']}
+    by_iso3 = tools._get_aggregate(passengers, filters, 'by_iso3')
+    assert list(by_iso3.index) == ['USA']
+    assert tools._get_aggregate(passengers, None, 'by_iso3') is not by_iso3
+    
+    keys = {(id(passengers), repr(None)), (id(passengers), repr(filters))}
+    assert keys <= tools._aggregate_cache.keys()
+    
+    # Entries are evicted once the frame is garbage collected
+    del passengers, by_year, by_iso3
+    gc.collect()
+    assert not keys & tools._aggregate_cache.keys()
+
+
 if __name__ == "__main__":
     print("🚀 Starting Data Analysis Agent Tests")
     print("=" * 60)
@@ -8,13 +8,15 @@ and complement insights with web research.
 
 import os
 import sys
+import time
 import pandas as pd
+import pytest
 from datetime import datetime
 
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agents.extensions.research_agent import ResearchAgent
+from agents.extensions.research_agent import ResearchAgent, SimpleResearchIntegration
 
 
 def test_research_agent():
@@ -209,6 +211,172 @@ def test_research_insights():
     print("✅ Research insights testing completed!")
 
 
+def _offline_agent():
+    """Research agent without API keys whose HTTP calls always fail."""
+    agent = ResearchAgent()
+    agent.api_keys = dict.fromkeys(agent.api_keys)
+    
+    def failing_get(url, **kwargs):
+        raise ConnectionError("sin red")
+    
+    agent.http.get = failing_get
+    return agent
+
+
+def test_research_log_is_per_call():
+    """Each call returns only its own messages; the shared agent keeps none."""
+    agent = _offline_agent()
+    
+    first = agent.research_topic("impacto de feriados")
+    levels = [level for level, _ in first['log']]
+    assert first['log'][0] == ('info', "🔍 Investigando: impacto de feriados")
+    assert levels.count('warning') == 2  # Wikipedia down and no Google API key
+    
+    second = agent.research_topic("crecimiento anual")
+    assert second['log'][0] == ('info', "🔍 Investigando: crecimiento anual")
+    assert not any("impacto de feriados" in message for _, message in second['log'])
+    
+    # A cache hit carries no messages from earlier calls
+    assert agent.research_topic("impacto de feriados")['log'] == []
+    assert not hasattr(agent, '_log')
+
+
+def test_background_refresh_does_not_leak_log():
+    """Messages from a background refresh are not returned to later callers."""
+    agent = _offline_agent()
+    agent.research_topic("impacto de feriados")
+    
+    # Expire the entry to trigger a background refresh
+    for key, (_, result) in list(agent.research_cache.items()):
+        agent.research_cache[key] = (0.0, result)
+    stale = agent.research_topic("impacto de feriados")
+    assert stale['log'] == []
+    
+    deadline = time.monotonic() + 10
+    while agent._refreshing and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not agent._refreshing
+    
+    assert agent.research_topic("impacto de feriados")['log'] == []
+
+
+def test_cache_hits_return_independent_copies():
+    """Mutating a returned result does not change the shared cache entry."""
+    agent = _offline_agent()
+    first = agent.research_topic("impacto de feriados")
+    first['insights'].append({'description': 'modificado'})
+    
+    fresh = agent.research_topic("impacto de feriados")
+    assert {'description': 'modificado'} not in fresh['insights']
+    fresh['recommendations'].clear()
+    
+    # Expired entries served while refreshing are copies too
+    for key, (_, result) in list(agent.research_cache.items()):
+        agent.research_cache[key] = (0.0, result)
+    stale = agent.research_topic("impacto de feriados")
+    assert stale['recommendations']
+    assert stale['insights'] is not fresh['insights']
+
+
+def test_simple_research_results_are_not_shared_mutable_state():
+    """Knowledge-base insights and recommendations cannot leak across calls."""
+    integration = SimpleResearchIntegration()
+    topic = "impacto de feriados en pasajeros"
+    first = integration.research_topic(topic)
+    assert first['insights'] and first['recommendations']
+    
+    with pytest.raises(TypeError):
+        first['insights'][0]['description'] = 'modificado'
+    with pytest.raises(TypeError):
+        first['recommendations'][0]['priority'] = 'low'
+    first['insights'].clear()
+    
+    second = integration.research_topic(topic)
+    assert second['insights']
+    assert second['insights'][0]['description'] != 'modificado'
+
+
+def _counting_searches(agent):
+    """Count how many researches actually run their searches."""
+    calls = []
+    run_searches = agent._run_searches
+    
+    def counted(topic, context=None, log=None):
+        calls.append(topic)
+        return run_searches(topic, context, log)
+    
+    agent._run_searches = counted
+    return calls
+
+
+def test_research_cache_hit_miss_and_eviction(monkeypatch):
+    """Repeated topics are served from cache; the least recently used is evicted."""
+    monkeypatch.setattr(sys.modules[ResearchAgent.__module__], 'RESEARCH_CACHE_SIZE', 2)
+    agent = _offline_agent()
+    calls = _counting_searches(agent)
+    
+    agent.research_topic("feriados")
+    agent.research_topic("feriados")
+    assert calls == ["feriados"]
+    
+    # A different context is a separate entry
+    agent.research_topic("feriados", {'filters': {'countries': ['CHL']}})
+    assert len(calls) == 2
+    
+    # Using "feriados" makes it the most recent, so the context entry is evicted
+    agent.research_topic("feriados")
+    agent.research_topic("turismo")
+    assert len(agent.research_cache) == 2
+    agent.research_topic("feriados")
+    assert len(calls) == 3
+    agent.research_topic("feriados", {'filters': {'countries': ['CHL']}})
+    assert len(calls) == 4
+
+
+def test_negative_cache_expires_after_ttl(monkeypatch):
+    """An empty Wikipedia lookup is skipped until NEGATIVE_CACHE_TTL passes."""
+    monkeypatch.setattr(sys.modules[ResearchAgent.__module__], 'NEGATIVE_CACHE_TTL', 0.5)
+    agent = ResearchAgent()
+    requested = []
+    
+    class NotFound:
+        status_code = 404
+        headers = {}
+    
+    def not_found(url, **kwargs):
+        requested.append(url)
+        return NotFound()
+    
+    agent.http.get = not_found
+    
+    assert agent._search_wikipedia("tema inexistente") is None
+    assert agent._search_wikipedia("tema inexistente") is None
+    assert len(requested) == 1
+    
+    time.sleep(0.6)
+    assert agent._search_wikipedia("tema inexistente") is None
+    assert len(requested) == 2
+
+
+def test_host_rate_limiter_spaces_same_host_only():
+    """Calls to one host are spaced out without delaying other hosts."""
+    import threading
+    limiter = sys.modules[ResearchAgent.__module__]._HostRateLimiter(100, 60.0, 0.2)
+    
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire("es.wikipedia.org")
+    assert time.monotonic() - start >= 0.4
+    
+    # A caller waiting on one host does not block another host
+    waiter = threading.Thread(target=limiter.acquire, args=("es.wikipedia.org",))
+    waiter.start()
+    start = time.monotonic()
+    limiter.acquire("newsapi.org")
+    assert time.monotonic() - start < 0.1
+    waiter.join()
+
+
 if __name__ == "__main__":
     print("🚀 Starting Research Agent Tests")
     print("=" * 60)
@@ -13,7 +13,7 @@ from datetime import datetime
 # Add the current directory to the path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from agents.extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent
+from agents.extensions.data_analysis_agent.simple_integration import simple_data_analysis_agent, SimpleDataAnalysisAgent
 
 
 def test_simple_data_analysis_agent():
@@ -108,6 +108,57 @@ def test_agent_with_real_data():
     print("✅ Real data loading test completed!")
 
 
+def _cache_test_context(**options):
+    """Small data context for the analysis cache tests."""
+    context = {
+        "data_loaded": True,
+        "current_filters": {},
+        "data": {
+            "passengers": pd.DataFrame({
+                'ISO3': ['USA', 'USA', 'MEX', 'MEX'],
+                'Year': [2020, 2021, 2020, 2021],
+                'Month': [1, 1, 1, 1],
+                'Total': [1000, 1200, 800, 900]
+            }),
+            "holidays": pd.DataFrame({
+                'ISO3': ['USA', 'MEX'],
+                'Date': ['2020-01-01', '2020-01-01'],
+                'Name': ['New Year', 'Año Nuevo'],
+                'Type': ['Public holiday', 'Public holiday']
+            })
+        }
+    }
+    context.update(options)
+    return context
+
+
+def test_analysis_cache_key_includes_result_options():
+    """A cached result is not reused when an output-changing option differs."""
+    agent = SimpleDataAnalysisAgent()
+    context = _cache_test_context(include_country_stats=False)
+    
+    without_stats = agent.analyze_user_query("diferencia versus", context)
+    assert "country_stats" not in without_stats["metrics"]
+    
+    del context["include_country_stats"]
+    with_stats = agent.analyze_user_query("diferencia versus", context)
+    assert "country_stats" in with_stats["metrics"]
+
+
+def test_analysis_cache_hit_returns_independent_copy():
+    """Mutating a returned result does not change later answers."""
+    agent = SimpleDataAnalysisAgent()
+    context = _cache_test_context()
+    
+    first = agent.analyze_user_query("tendencia", context)
+    original_insights = list(first["insights"])
+    first["insights"].append("modificado por el llamador")
+    
+    second = agent.analyze_user_query("tendencia", context)
+    assert second is not first
+    assert second["insights"] == original_insights
+
+
 if __name__ == "__main__":
     print("🚀 Starting Simple Data Analysis Agent Tests")
     print("=" * 60)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the Smart Chat Agent.
+
+These tests replace the Gemini model with a stub, so they run without an
+API key or network access.
+"""
+
+import os
+import sys
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+# Add the current directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from agents.extensions import smart_chat_agent
+from agents.extensions.smart_chat_agent import SmartChatAgent
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StubModel:
+    """Gemini stand-in that honours request_options['retry'] like the SDK."""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def generate_content(self, prompt, request_options=None):
+        def call():
+            self.calls += 1
+            if self.failures:
+                raise self.failures.pop(0)
+            return _Response(f"respuesta {self.calls}")
+
+        retry = (request_options or {}).get('retry')
+        return retry(call)() if retry else call()
+
+
+def _free_gemini_slots():
+    """Number of Gemini slots that can be taken right now."""
+    taken = 0
+    while smart_chat_agent._gemini_slots.acquire(blocking=False):
+        taken += 1
+    for _ in range(taken):
+        smart_chat_agent._gemini_slots.release()
+    return taken
+
+
+@pytest.fixture
+def fast_retry(monkeypatch):
+    """Keep the production retry policy but without the real backoff delays."""
+    options = dict(smart_chat_agent.GEMINI_REQUEST_OPTIONS)
+    options['retry'] = options['retry'].with_delay(initial=0.01, maximum=0.01)
+    monkeypatch.setattr(smart_chat_agent, 'GEMINI_REQUEST_OPTIONS', options)
+
+
+def test_resource_exhausted_is_retried_and_slot_released(fast_retry):
+    """A 429 from Gemini is retried and the concurrency slot is given back."""
+    agent = SmartChatAgent()
+    agent.model = _StubModel([api_exceptions.ResourceExhausted("cuota agotada")])
+
+    response = agent._generate_general_response("hola", {})
+
+    assert response == "respuesta 2"
+    assert agent.model.calls == 2
+    assert _free_gemini_slots() == smart_chat_agent.GEMINI_MAX_CONCURRENCY
+
+
+def test_gemini_slot_released_on_non_retryable_error(fast_retry):
+    """Errors that are not retried still release the concurrency slot."""
+    agent = SmartChatAgent()
+    agent.model = _StubModel([api_exceptions.InvalidArgument("prompt inválido")])
+
+    with pytest.raises(api_exceptions.InvalidArgument):
+        agent._generate_general_response("hola", {})
+
+    assert agent.model.calls == 1
+    assert _free_gemini_slots() == smart_chat_agent.GEMINI_MAX_CONCURRENCY
+
+
+def test_general_response_cache_hit_miss_and_eviction(monkeypatch):
+    """Repeated questions reuse the answer; the oldest entry is evicted first."""
+    monkeypatch.setattr(smart_chat_agent, 'GENERAL_RESPONSE_CACHE_SIZE', 2)
+    agent = SmartChatAgent()
+    agent.model = _StubModel()
+
+    # Miss, then hit: case and spacing do not change the key
+    assert agent._generate_general_response("Hola  mundo", {}) == "respuesta 1"
+    assert agent._generate_general_response("hola mundo", {}) == "respuesta 1"
+    assert agent.model.calls == 1
+
+    # A different context is a different question
+    context = {'passengers': {'total_records': 10, 'countries': 2}}
+    assert agent._generate_general_response("hola mundo", context) == "respuesta 2"
+
+    # A third entry evicts the oldest one
+    assert agent._generate_general_response("otra pregunta", {}) == "respuesta 3"
+    assert len(agent._response_cache) == 2
+    assert agent._generate_general_response("hola mundo", {}) == "respuesta 4"
+    assert agent.model.calls == 4